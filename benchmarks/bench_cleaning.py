@@ -0,0 +1,169 @@
+# benchmarks/bench_cleaning.py
+#
+# Compare data_ingestion.cleaning against the logic of the cleaning
+# notebooks on synthetic wide Eurostat / ECB tables
+# (50 countries x 60 years x 100 age groups by default):
+#
+#   python -m benchmarks.bench_cleaning --countries 50 --years 60 --ages 100
+#
+# Each run happens in its own process; memory is the peak RSS growth on top
+# of the generated input.
+
+import argparse
+import gc
+import multiprocessing as mp
+import resource
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_ingestion.cleaning import clean_gdp, clean_hicp, clean_population
+
+REGIONS = ["FR", "DE", "EA19"]
+
+
+def _countries(n):
+    return REGIONS + [f"C{i:02d}" for i in range(n - len(REGIONS))]
+
+
+def make_population(countries, years, ages, seed=0):
+    """Wide demo_pjan-shaped dump: one row per (age, sex, geo), <year>_value / <year>_flag columns."""
+    rng = np.random.default_rng(seed)
+    geos = _countries(countries)
+    age_codes = ["TOTAL"] + [f"Y{i}" for i in range(ages - 1)]
+    keys = pd.MultiIndex.from_product([age_codes, ["T", "M", "F"], geos], names=["age", "sex", "geo\\TIME_PERIOD"])
+    df = keys.to_frame(index=False)
+    df.insert(0, "unit", "NR")
+    df.insert(0, "freq", "A")
+    n = len(df)
+    columns = {}
+    for year in range(2024 - years + 1, 2025):
+        values = rng.integers(1_000, 80_000_000, n).astype(np.float64)
+        values[rng.random(n) < 0.1] = np.nan
+        columns[f"{year}_value"] = values
+        columns[f"{year}_flag"] = rng.choice([None, "p", "e"], n)
+    return pd.concat([df, pd.DataFrame(columns)], axis=1)
+
+
+def make_gdp(countries, years, series, seed=0):
+    """Wide GDP table as read from eurostat_gdp_raw.csv: "1975 " headers, ": " gaps and "p" flags."""
+    rng = np.random.default_rng(seed)
+    geos = _countries(countries)
+    df = pd.DataFrame({
+        "freq": "A",
+        "unit": np.repeat([f"U{i:02d}" for i in range(series)], len(geos)),
+        "na_item": "B1GQ",
+        "geo\\TIME_PERIOD": np.tile(geos, series),
+    })
+    n = len(df)
+    columns = {}
+    for year in range(2024 - years + 1, 2025):
+        values = rng.uniform(1e3, 1e7, n).round(1).astype(str)
+        cells = np.where(rng.random(n) < 0.15, ": ", np.char.add(values, " "))
+        columns[f"{year} "] = cells
+    return pd.concat([df, pd.DataFrame(columns, dtype=object)], axis=1)
+
+
+def make_hicp(countries, years, seed=0):
+    """Raw ECB dump: one monthly observation per row plus a few descriptive columns."""
+    rng = np.random.default_rng(seed)
+    periods = pd.period_range(f"{2024 - years + 1}-01", "2024-12", freq="M").astype(str)
+    geos = _countries(countries)
+    n = len(periods) * len(geos)
+    return pd.DataFrame({
+        "KEY": "ICP.M.X.N.000000.4.INX",
+        "FREQ": "M",
+        "REF_AREA": np.repeat(geos, len(periods)),
+        "TIME_PERIOD": np.tile(periods, len(geos)),
+        "OBS_VALUE": rng.uniform(50, 150, n).round(2),
+        "UNIT": "PURE_NUMB",
+        "TITLE": "HICP - Overall index",
+    })
+
+
+# --- Notebook logic, as in notebooks/*.ipynb ---------------------------------
+
+def notebook_gdp(df_raw):
+    df_raw = df_raw.copy()
+    df_raw.columns = df_raw.columns.str.strip()
+    year_cols = [col for col in df_raw.columns if col.isnumeric()]
+    df_melted = df_raw.melt(id_vars=["geo\\TIME_PERIOD"], value_vars=year_cols, var_name="year", value_name="value")
+    df_melted.rename(columns={"geo\\TIME_PERIOD": "geo"}, inplace=True)
+    df_melted["year"] = pd.to_datetime(df_melted["year"], format="%Y")
+    df_melted["value"] = pd.to_numeric(df_melted["value"].str.replace(":", "", regex=False), errors="coerce")
+    return df_melted.dropna(subset=["value"])
+
+
+def notebook_hicp(df_raw):
+    df = df_raw[["TIME_PERIOD", "OBS_VALUE", "UNIT", "REF_AREA"]].copy()
+    df.columns = ["date", "hicp_index", "unit", "region"]
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date", "hicp_index"])
+    return df.reset_index(drop=True)
+
+
+def notebook_population(df):
+    df = df.rename(columns={"geo\\TIME_PERIOD": "geo"})
+    value_cols = [col for col in df.columns if col.endswith("_value")]
+    df_long = df.melt(id_vars=["geo", "sex", "age"], value_vars=value_cols, var_name="year_flag", value_name="population")
+    df_long["year"] = df_long["year_flag"].str.replace("_value", "").astype(int)
+    df_long = df_long.drop(columns=["year_flag"])
+    df_long = df_long[(df_long["sex"] == "T") & (df_long["age"] == "TOTAL")]
+    df_long = df_long[df_long["geo"].isin(REGIONS)]
+    df_clean = df_long[["geo", "year", "population"]].rename(columns={"geo": "region"})
+    df_clean = df_clean.dropna(subset=["population"])
+    df_clean["population"] = df_clean["population"].astype(int)
+    return df_clean
+
+
+CASES = {
+    "gdp": {"notebook": notebook_gdp, "cleaning": clean_gdp},
+    "hicp": {"notebook": notebook_hicp, "cleaning": clean_hicp},
+    "population": {
+        "notebook": notebook_population,
+        "cleaning": lambda df: clean_population(df, regions=REGIONS),
+    },
+}
+
+
+def _input(dataset, args):
+    if dataset == "gdp":
+        return make_gdp(args["countries"], args["years"], args["ages"])
+    if dataset == "hicp":
+        return make_hicp(args["countries"], args["years"])
+    return make_population(args["countries"], args["years"], args["ages"])
+
+
+def _worker(dataset, variant, args, queue):
+    df = _input(dataset, args)
+    gc.collect()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = CASES[dataset][variant](df)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((len(df), len(result), elapsed, (peak - baseline) / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cleaning functions against the notebook logic.")
+    parser.add_argument("--countries", type=int, default=50)
+    parser.add_argument("--years", type=int, default=60)
+    parser.add_argument("--ages", type=int, default=100, help="age groups (population) / series per country (GDP)")
+    args = vars(parser.parse_args())
+
+    print(f"{'dataset':<11} {'variant':<9} {'input rows':>11} {'output rows':>12} {'seconds':>9} {'extra RSS (MB)':>15}")
+    ctx = mp.get_context("spawn")
+    for dataset, variants in CASES.items():
+        for variant in variants:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_worker, args=(dataset, variant, args, queue))
+            proc.start()
+            n_in, n_out, elapsed, extra_mb = queue.get()
+            proc.join()
+            print(f"{dataset:<11} {variant:<9} {n_in:>11,} {n_out:>12,} {elapsed:>9.3f} {extra_mb:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
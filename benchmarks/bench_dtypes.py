@@ -0,0 +1,99 @@
+# benchmarks/bench_dtypes.py
+#
+# Memory and latency of the indicators frame in three representations, on a
+# synthetic core_economic_indicators table (1M rows by default):
+#
+#   decimal  - what psycopg2 returns for NUMERIC: Decimal objects, int64 years
+#   float64  - floats via coerce_float, country as strings
+#   schema   - dashboard.data_access.apply_schema(INDICATOR_DTYPES) applied to
+#              the float64 frame, as the dashboard does after read_query
+#
+#   python -m benchmarks.bench_dtypes --rows 1000000 --years 64
+#
+# The operations are the ones the pages run on every interaction: an isin /
+# year-range filter, a per-country groupby mean and a country x year
+# pivot_table.
+
+import argparse
+import time
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data_access import INDICATOR_DTYPES, apply_schema
+
+
+def make_indicators(rows, years, seed=0):
+    """One row per (country, year) like core_economic_indicators, NUMERIC columns as Decimal."""
+    rng = np.random.default_rng(seed)
+    n_countries = -(-rows // years)
+    countries = [f"C{i:05d}" for i in range(n_countries)]
+    df = pd.DataFrame({
+        "country": np.repeat(np.array(countries, dtype=object), years)[:rows],
+        "year": np.tile(np.arange(2024 - years + 1, 2025, dtype=np.int64), n_countries)[:rows],
+    })
+    gdp = rng.uniform(1e3, 4e6, rows).round(1)
+    hicp = rng.uniform(50, 200, rows).round(2)
+    population = rng.integers(300_000, 85_000_000, rows).astype(np.float64)
+    population[rng.random(rows) < 0.05] = np.nan
+    df["gdp_eur_millions"] = _decimals(gdp)
+    df["avg_hicp_index"] = _decimals(hicp)
+    df["population"] = _decimals(population)
+    df["gdp_per_capita"] = _decimals((gdp * 1e6 / population).round(2))
+    return df.astype({"country": object}), countries
+
+
+def _decimals(values):
+    # str() first so the Decimals carry the database's scale, as NUMERIC values do
+    return pd.Series([None if np.isnan(v) else Decimal(str(v)) for v in values], dtype=object)
+
+
+def _variants(raw):
+    """Each representation with the seconds apply_schema took to produce it from the previous one."""
+    start = time.perf_counter()
+    float64 = apply_schema(raw, {col: "float64" for col in raw.columns if col not in ("country", "year")})
+    float64 = float64.astype({"country": "str"})
+    from_decimal = time.perf_counter() - start
+    start = time.perf_counter()
+    schema = apply_schema(float64, INDICATOR_DTYPES)
+    from_float = time.perf_counter() - start
+    return {"decimal": (raw, None), "float64": (float64, from_decimal), "schema": (schema, from_float)}
+
+
+def _timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the indicators frame's in-memory dtypes.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--years", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=1, help="best of N timings (the decimal pivot alone takes minutes at 1M rows)")
+    args = parser.parse_args()
+
+    raw, countries = make_indicators(args.rows, args.years)
+    selected = countries[::3]
+    first, last = 2024 - args.years // 2, 2024
+
+    operations = {
+        "filter": lambda df: df[df["country"].isin(selected) & df["year"].between(first, last)],
+        "groupby": lambda df: df.groupby("country")[["gdp_eur_millions", "avg_hicp_index"]].mean(),
+        "pivot": lambda df: df.pivot_table(index="country", columns="year", values="avg_hicp_index", aggfunc="mean"),
+    }
+
+    print(f"{'variant':<9} {'rows':>10} {'memory (MB)':>12} {'convert s':>10} " + " ".join(f"{op + ' s':>10}" for op in operations))
+    for name, (df, convert) in _variants(raw).items():
+        memory = df.memory_usage(deep=True).sum() / 2**20
+        timings = [_timed(lambda: op(df), args.repeat) for op in operations.values()]
+        convert = f"{convert:>10.3f}" if convert is not None else f"{'-':>10}"
+        print(f"{name:<9} {len(df):>10,} {memory:>12.1f} {convert} " + " ".join(f"{t:>10.3f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
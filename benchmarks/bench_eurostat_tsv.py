@@ -0,0 +1,103 @@
+# benchmarks/bench_eurostat_tsv.py
+#
+# Benchmark the Eurostat TSV parsers on a synthetic multi-hundred-MB
+# extract shaped like nama_10_gdp:
+#
+#   python -m benchmarks.bench_eurostat_tsv --size-mb 300
+#
+# Each parser runs in its own process so peak RSS is measured separately.
+
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+from data_ingestion.eurostat_tsv import iter_records, iter_tsv_chunks
+
+YEARS = list(range(1975, 2025))
+
+
+def write_synthetic_tsv(path, size_mb, seed=0):
+    """Write a wide Eurostat-style TSV of roughly `size_mb` MB with ':' gaps and flags."""
+    rng = np.random.default_rng(seed)
+    target = size_mb * 1024 * 1024
+    header = "freq,unit,na_item,geo\\TIME_PERIOD\t" + "\t".join(f"{y} " for y in YEARS) + "\n"
+    written = 0
+    series = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(header)
+        while written < target:
+            values = rng.uniform(1e3, 1e7, len(YEARS)).round(1)
+            missing = rng.random(len(YEARS)) < 0.15
+            flags = rng.choice(["", "", "", "p", "e", "b"], len(YEARS))
+            cells = [": " if m else f"{v} {fl}" for v, m, fl in zip(values, missing, flags)]
+            line = f"A,CP_MEUR,B1G{series % 50:02d},G{series // 50:05d}\t" + "\t".join(cells) + "\n"
+            f.write(line)
+            written += len(line)
+            series += 1
+    return series
+
+
+def run_string_replace(path):
+    """The old convert_tsv_to_csv: whole file in memory, tabs → commas."""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    out = content.replace("\t", ",")
+    return out.count("\n")
+
+
+def run_iter_records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for _ in iter_records(f))
+
+
+def run_vectorised(path):
+    return sum(len(chunk) for chunk in iter_tsv_chunks(path))
+
+
+PARSERS = {
+    "string replace (old)": run_string_replace,
+    "iter_records (streaming)": run_iter_records,
+    "iter_tsv_chunks (vectorised)": run_vectorised,
+}
+
+
+def _worker(name, path, queue):
+    start = time.perf_counter()
+    rows = PARSERS[name](path)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((rows, elapsed, peak_mb))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Eurostat TSV parsers.")
+    parser.add_argument("--size-mb", type=int, default=300)
+    parser.add_argument("--path", help="parse an existing TSV instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if not path:
+            path = os.path.join(tmp, "synthetic.tsv")
+            series = write_synthetic_tsv(path, args.size_mb)
+            print(f"Generated {series:,} series in {path}")
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        print(f"{'parser':<30} {'rows':>12} {'seconds':>9} {'MB/s':>8} {'peak RSS (MB)':>14}")
+        ctx = mp.get_context("spawn")
+        for name in PARSERS:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_worker, args=(name, path, queue))
+            proc.start()
+            rows, elapsed, peak_mb = queue.get()
+            proc.join()
+            print(f"{name:<30} {rows:>12,} {elapsed:>9.2f} {size_mb / elapsed:>8.1f} {peak_mb:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
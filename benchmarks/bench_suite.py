@@ -0,0 +1,311 @@
+# benchmarks/bench_suite.py
+#
+# End-to-end benchmark at several data scales. For each scale, synthetic data
+# (benchmarks/synthetic_data.py) is generated under <workdir>/<scale>x/ and
+# every step below runs there, in a process of its own:
+#
+#   generate  the synthetic raw and cleaned files
+#   parse     raw files -> frames with the ingestion parsers
+#   clean     the pipeline's clean stages (raw -> cleaned CSV + Parquet)
+#   load      COPY into PostgreSQL (only with EUROMETRICS_BENCH_DB_URL)
+#   model     the dbt staging and core models built on DuckDB, plus
+#             `dbt run --full-refresh` with --dbt-target
+#   page      each Streamlit page through AppTest on the DuckDB backend, in
+#             the order a user would visit them: the first run (its own
+#             caches cold) and a rerun (everything cached)
+#
+#   python -m benchmarks.bench_suite --scales 1 100 10000
+#
+# Scale 1 is the size of the repo's own data (3 countries x 30 years); scale
+# s has 3 x s countries. Every step is appended to logs/benchmark_runs.jsonl
+# as one JSON object per line and compared with the most recent earlier
+# measurement of the same step. Steps slower by more than --tolerance, and
+# steps that used to pass but now fail, are reported as regressions; with
+# --fail-on-regression the exit status is then 1.
+
+import argparse
+import gzip
+import io
+import json
+import multiprocessing as mp
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+import pandas as pd
+from sqlalchemy import create_engine
+from streamlit.testing.v1 import AppTest
+
+from benchmarks import synthetic_data
+from dashboard import data_access
+from data_ingestion import fetch_ecb_hicp, fetch_eurostat_gdp
+from data_ingestion.cleaning import clean_hicp
+from data_ingestion.eurostat_tsv import read_tsv
+from data_ingestion.fetch_eurostat_population import write_population
+from data_ingestion.insert_cleaned_gdp import insert_cleaned_gdp
+from data_ingestion.load_population_to_postgres import load_population
+
+REPORT_PATH = os.path.join("logs", "benchmark_runs.jsonl")
+DEFAULT_WORKDIR = "bench_data"
+DEFAULT_SCALES = [1, 100, 10_000]
+BASE_COUNTRIES = 3
+DEFAULT_YEARS = 30
+
+PAGES = [
+    "Overview.py",
+    "pages/Inflation_analysis.py",
+    "pages/Comparative_analysis.py",
+    "pages/Data_Explorer.py",
+]
+DEFAULT_PAGE_TIMEOUT = 600
+
+# A step regresses when it is this many times slower than before and the
+# difference is above the noise floor (seconds)
+DEFAULT_TOLERANCE = 1.5
+NOISE_FLOOR_SECONDS = 0.05
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+# --- Steps (run inside the scale's directory) --------------------------------
+
+def _parse_steps(codes):
+    def sub_indices():
+        path = os.path.join("data", "ecb_hicp_coicop.csv")
+        if not os.path.exists(path):
+            return 0
+        columns = ("REF_AREA", "ICP_ITEM", "TIME_PERIOD", "OBS_VALUE")
+        return len(clean_hicp(pd.read_csv(path, usecols=lambda c: c in columns, dtype={"TIME_PERIOD": str})))
+
+    return [
+        ("gdp", lambda: len(read_tsv(fetch_eurostat_gdp.GDP_RAW_TSV_PATH))),
+        ("hicp", lambda: sum(
+            len(fetch_ecb_hicp.parse_region(fetch_ecb_hicp.raw_path_for(code), code)) for code in codes
+        )),
+        ("hicp_sub_indices", sub_indices),
+        ("population", lambda: len(read_tsv(
+            os.path.join("data", "demo_pjan.tsv.gz"), filters={"sex": ["T"], "age": ["TOTAL"], "geo": codes},
+        ))),
+    ]
+
+
+def _clean_steps(codes):
+    def population():
+        with gzip.open(os.path.join("data", "demo_pjan.tsv.gz"), "rt", encoding="utf-8") as lines:
+            return write_population(lines, regions=codes)
+
+    return [
+        ("gdp", lambda: len(fetch_eurostat_gdp.clean_gdp_tsv(fetch_eurostat_gdp.GDP_RAW_TSV_PATH))),
+        ("hicp", lambda: len(fetch_ecb_hicp.clean_hicp({code: fetch_ecb_hicp.raw_path_for(code) for code in codes}))),
+        ("population", population),
+    ]
+
+
+def _load_steps(database_url):
+    engine = create_engine(database_url)
+    return [
+        ("gdp", lambda: insert_cleaned_gdp(engine, mode="swap")),
+        ("hicp", lambda: fetch_ecb_hicp.load_hicp(engine=engine)),
+        ("population", lambda: load_population(engine)),
+    ]
+
+
+def _model_steps(repo, dbt_target):
+    def duckdb_models():
+        # Builds (and caches) the same database the pages below then query
+        con = data_access.get_duckdb(data_access.data_version())
+        return con.execute("SELECT count(*) FROM core_economic_indicators").fetchone()[0]
+
+    def dbt_run():
+        subprocess.run(
+            ["dbt", "run", "--full-refresh", "--target", dbt_target],
+            cwd=os.path.join(repo, "eurometrics_dbt"), check=True, capture_output=True,
+        )
+
+    steps = [("duckdb", duckdb_models)]
+    if dbt_target:
+        steps.append(("dbt_postgres", dbt_run))
+    return steps
+
+
+def _page_steps(repo, timeout):
+    def run(app):
+        app.run()
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+
+    steps = []
+    for page in PAGES:
+        app = AppTest.from_file(os.path.join(repo, page), default_timeout=timeout)
+        name = os.path.splitext(os.path.basename(page))[0]
+        steps.append((f"{name}.first_run", lambda app=app: run(app)))
+        steps.append((f"{name}.rerun", lambda app=app: run(app)))
+    return steps
+
+
+def _run_scale(scale, root, args, repo, results):
+    """Worker: time every step of one scale, putting one record per step on `results`."""
+    countries = BASE_COUNTRIES * scale
+    codes = synthetic_data.country_codes(countries)
+    os.makedirs(root, exist_ok=True)
+    os.chdir(root)
+    # The DuckDB backend reads the models from ./eurometrics_dbt
+    if not os.path.exists("eurometrics_dbt"):
+        os.symlink(os.path.join(repo, "eurometrics_dbt"), "eurometrics_dbt")
+    os.environ["EUROMETRICS_BACKEND"] = "duckdb"
+
+    def timed(stage, step, fn):
+        start = time.perf_counter()
+        try:
+            # The ingestion scripts report progress on stdout; keep the table readable
+            with redirect_stdout(io.StringIO()):
+                rows = fn()
+            status = "ok"
+        except Exception as exc:
+            rows, status = None, f"error: {type(exc).__name__}: {exc}"[:300]
+        results.put({
+            "scale": scale, "countries": countries, "years": args["years"], "items": args["items"],
+            "stage": stage, "step": step, "rows": rows if isinstance(rows, int) else None,
+            "seconds": round(time.perf_counter() - start, 4), "status": status,
+        })
+
+    if not (args["reuse_data"] and os.path.isdir("data")):
+        timed("generate", "all", lambda: sum(synthetic_data.generate(
+            ".", countries, args["years"], args["items"], args["ages"], seed=args["seed"],
+        ).values()))
+
+    stages = [("parse", _parse_steps(codes)), ("clean", _clean_steps(codes))]
+    if args["database_url"]:
+        stages.append(("load", _load_steps(args["database_url"])))
+    stages.append(("model", _model_steps(repo, args["dbt_target"])))
+    if not args["skip_pages"]:
+        stages.append(("page", _page_steps(repo, args["page_timeout"])))
+
+    for stage, steps in stages:
+        for step, fn in steps:
+            timed(stage, step, fn)
+    results.put(None)
+
+
+# --- Report -------------------------------------------------------------------
+
+def _key(record):
+    return record["scale"], record["years"], record["items"], record["stage"], record["step"]
+
+
+def load_baseline(path):
+    """Most recent earlier record of every (scale, years, items, stage, step) in a JSON-lines report."""
+    baseline = {}
+    if not os.path.exists(path):
+        return baseline
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                baseline[_key(record)] = record
+    return baseline
+
+
+def regression(record, previous, tolerance=DEFAULT_TOLERANCE):
+    """Why `record` regressed against `previous` (None if it did not)."""
+    if previous is None or previous["status"] != "ok":
+        return None
+    if record["status"] != "ok":
+        return "now fails"
+    slower = record["seconds"] - previous["seconds"]
+    if record["seconds"] > tolerance * previous["seconds"] and slower > NOISE_FLOOR_SECONDS:
+        return f"{record['seconds'] / previous['seconds']:.1f}x slower ({previous['seconds']:.3f}s before)"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time ingestion, models and pages on synthetic data at several scales.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help=f"multiples of the repo's data ({BASE_COUNTRIES} countries)")
+    parser.add_argument("--years", type=int, default=DEFAULT_YEARS)
+    parser.add_argument("--items", type=int, default=12, help="COICOP sub-indices per country")
+    parser.add_argument("--ages", type=int, default=5, help="age groups in demo_pjan besides TOTAL")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="where each scale's data/ is generated")
+    parser.add_argument("--reuse-data", action="store_true", help="skip generation when a scale's data/ exists")
+    parser.add_argument("--skip-pages", action="store_true")
+    parser.add_argument("--page-timeout", type=float, default=DEFAULT_PAGE_TIMEOUT, help="seconds per page run")
+    parser.add_argument("--dbt-target", default=None,
+                        help="profiles.yml target (pointing at the benchmark database) for dbt run")
+    parser.add_argument("--report", default=REPORT_PATH, help="JSON-lines file the results are appended to")
+    parser.add_argument("--baseline", default=None, help="report to compare with (default: --report)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    repo = os.getcwd()
+    baseline = load_baseline(args.baseline or args.report)
+    run = {
+        "run_id": uuid.uuid4().hex[:12],
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+    }
+    worker_args = {
+        "years": args.years, "items": args.items, "ages": args.ages, "seed": args.seed,
+        "reuse_data": args.reuse_data, "skip_pages": args.skip_pages, "page_timeout": args.page_timeout,
+        "database_url": os.environ.get("EUROMETRICS_BENCH_DB_URL"), "dbt_target": args.dbt_target,
+    }
+
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+    # Workers call the cached loaders outside a Streamlit server; silence the warnings about it
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    regressions = []
+    print(f"{'scale':>7} {'stage':<9} {'step':<32} {'rows':>12} {'seconds':>9}  status")
+    ctx = mp.get_context("spawn")
+    for scale in args.scales:
+        root = os.path.abspath(os.path.join(args.workdir, f"{scale}x"))
+        if not args.reuse_data:
+            shutil.rmtree(root, ignore_errors=True)
+        results = ctx.Queue()
+        proc = ctx.Process(target=_run_scale, args=(scale, root, worker_args, repo, results))
+        proc.start()
+        while True:
+            try:
+                record = results.get(timeout=1)
+            except queue.Empty:
+                if not proc.is_alive():
+                    print(f"❌ scale {scale}x: worker exited with status {proc.exitcode}")
+                    break
+                continue
+            if record is None:
+                break
+            record = {**run, **record}
+            with open(args.report, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            rows = "" if record["rows"] is None else f"{record['rows']:,}"
+            print(f"{scale:>6}x {record['stage']:<9} {record['step']:<32} {rows:>12} {record['seconds']:>9.3f}  "
+                  f"{record['status']}")
+            why = regression(record, baseline.get(_key(record)), args.tolerance)
+            if why:
+                regressions.append(f"{scale}x {record['stage']}.{record['step']}: {why}")
+        # A page that timed out may leave its script thread running
+        proc.join(timeout=10)
+        if proc.is_alive():
+            proc.terminate()
+
+    print(f"✅ Results appended to {args.report} (run {run['run_id']})")
+    for line in regressions:
+        print(f"⚠️ Regression: {line}")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# benchmarks/synthetic_data.py
+#
+# Synthetic GDP, HICP and population data for N countries x M years, written
+# in the formats of the files in data/ so the ingestion scripts, the dbt
+# models and the dashboard can be run at any scale:
+#
+#   python -m benchmarks.synthetic_data --countries 300 --years 30 --items 12 --out bench_data/300
+#
+# <out>/data/ then holds
+#   eurostat_gdp_raw.tsv       NAMA_10_GDP extract, ": " gaps and "p" flags
+#   ecb_hicp_<code>.csv        one ECB csvdata dump per country (overall index)
+#   ecb_hicp_coicop.csv        COICOP sub-indices of the first countries
+#   demo_pjan.tsv.gz           demo_pjan extract (age x sex x geo)
+#   cleaned_*.csv              the cleaned tables the loaders read
+#
+# Series follow simple random walks (nominal GDP growth, monthly inflation,
+# population drift) with late starts and provisional flags, so value ranges,
+# gaps and file sizes look like the real extracts.
+
+import argparse
+import gzip
+import os
+
+import numpy as np
+import pandas as pd
+
+END_YEAR = 2024
+
+# The real regions come first, so scale 1 has the repo's three series
+REGIONS = ["FR", "DE", "EA19"]
+
+# ECB REF_AREA codes that differ from our region codes
+ECB_REF_AREAS = {"EA19": "U2"}
+
+# Countries that get COICOP sub-indices (the ECB publishes them for the
+# euro-area aggregates and member states, not for every region)
+SUB_INDEX_COUNTRIES = 50
+
+COICOP_DIVISIONS = [
+    "Food and non-alcoholic beverages", "Alcoholic beverages and tobacco", "Clothing and footwear",
+    "Housing, water, electricity, gas and other fuels", "Furnishings and household equipment",
+    "Health", "Transport", "Communications", "Recreation and culture", "Education",
+    "Restaurants and hotels", "Miscellaneous goods and services",
+]
+
+# Columns of an ECB csvdata dump, in order
+ECB_COLUMNS = [
+    "KEY", "FREQ", "REF_AREA", "ADJUSTMENT", "ICP_ITEM", "STS_INSTITUTION", "ICP_SUFFIX",
+    "TIME_PERIOD", "OBS_VALUE", "OBS_STATUS", "OBS_CONF", "OBS_PRE_BREAK", "OBS_COM",
+    "TIME_FORMAT", "BREAKS", "COLLECTION", "COMPILING_ORG", "DATA_COMP", "DISS_ORG",
+    "DOM_SER_IDS", "PUBL_ECB", "PUBL_MU", "PUBL_PUBLIC", "UNIT_INDEX_BASE", "COMPILATION",
+    "COVERAGE", "DECIMALS", "SOURCE_AGENCY", "TITLE", "TITLE_COMPL", "UNIT", "UNIT_MULT",
+]
+
+
+def country_codes(n):
+    """`n` region codes: FR, DE, EA19, then X00001, X00002, ..."""
+    return REGIONS[:n] + [f"X{i:05d}" for i in range(1, n - len(REGIONS) + 1)]
+
+
+def coicop_items(n):
+    """(ICP_ITEM, title) of `n` sub-indices: the 12 COICOP divisions, then groups within them."""
+    items = []
+    for i in range(n):
+        division, group = i % len(COICOP_DIVISIONS), i // len(COICOP_DIVISIONS)
+        title = "HICP - " + COICOP_DIVISIONS[division] + (f" - group {group}" if group else "")
+        items.append((f"{division + 1:02d}{group:02d}00", title))
+    return items
+
+
+def _walk(start, growth):
+    """Series ending at `start` (one per row) whose period-on-period growth rates are `growth`."""
+    # Cumulate backwards from the last period
+    factors = np.cumprod(np.concatenate([np.ones((len(start), 1)), 1 + growth[:, :0:-1]], axis=1), axis=1)
+    return start[:, None] / factors[:, ::-1]
+
+
+def _late_starts(rng, n, periods, max_fraction=0.5):
+    """First observed period of each series; about a third of them start late."""
+    starts = rng.integers(0, max(1, int(periods * max_fraction)), n)
+    return np.where(rng.random(n) < 0.35, starts, 0)
+
+
+def _tsv_cells(values, flags):
+    """Eurostat TSV cells: "1234.5 ", "1234.5 p" or ": " for NaN."""
+    text = np.char.add(np.char.mod("%.1f", np.nan_to_num(values)), " ")
+    text = np.char.add(text, flags)
+    return np.where(np.isnan(values), ": ", text)
+
+
+def _write_tsv(path, header, keys, cells, opener=open):
+    with opener(path, "wt", encoding="utf-8", newline="") as f:
+        f.write(header + "\n")
+        for key, row in zip(keys, cells):
+            f.write(key + "\t" + "\t".join(row) + "\n")
+
+
+# --- GDP -------------------------------------------------------------------
+
+def gdp_values(rng, n, years):
+    """(n, years) nominal GDP in million EUR, NaN before each series starts."""
+    latest = np.clip(rng.lognormal(np.log(2e5), 1.5, n), 1e3, 2e7)
+    values = _walk(latest, rng.normal(0.04, 0.03, (n, years)).clip(-0.1, 0.2)).round(1)
+    starts = _late_starts(rng, n, years)
+    values[np.arange(years)[None, :] < starts[:, None]] = np.nan
+    return values
+
+
+def write_gdp(data_dir, codes, years, rng):
+    year_labels = list(range(END_YEAR - years + 1, END_YEAR + 1))
+    values = gdp_values(rng, len(codes), years)
+    # The last three years are provisional
+    flags = np.where(np.arange(years) >= years - 3, "p", "")[None, :].repeat(len(codes), axis=0)
+
+    header = "freq,unit,na_item,geo\\TIME_PERIOD\t" + "\t".join(f"{y} " for y in year_labels)
+    keys = [f"A,CP_MEUR,B1GQ,{code}" for code in codes]
+    _write_tsv(os.path.join(data_dir, "eurostat_gdp_raw.tsv"), header, keys, _tsv_cells(values, flags))
+
+    present = ~np.isnan(values)
+    rows, cols = np.nonzero(present)
+    cleaned = pd.DataFrame({
+        "geo": np.asarray(codes)[rows],
+        "year": [f"{year_labels[c]}-01-01" for c in cols],
+        "value": values[rows, cols],
+    }).sort_values(["geo", "year"], ignore_index=True)
+    cleaned.to_csv(os.path.join(data_dir, "cleaned_eurostat_gdp.csv"), index=False)
+    return len(cleaned)
+
+
+# --- HICP ------------------------------------------------------------------
+
+def hicp_values(rng, n, months, inflation=None):
+    """(n, months) HICP index (base year = 100), NaN for the unpublished leading months."""
+    inflation = rng.normal(0.022, 0.01, n).clip(-0.01, 0.08) if inflation is None else inflation
+    seasonal = 0.003 * np.sin(2 * np.pi * np.arange(months) / 12)
+    steps = inflation[:, None] / 12 + seasonal[None, :] + rng.normal(0, 0.003, (n, months))
+    index = np.exp(np.cumsum(steps, axis=1))
+    # Rebase on 2015 (or the first year when it is out of range)
+    first_year = END_YEAR - months // 12 + 1
+    base = (2015 - first_year) * 12 if first_year <= 2015 else 0
+    index = (index / index[:, base:base + 12].mean(axis=1, keepdims=True) * 100).round(2)
+    index[np.arange(months)[None, :] < rng.integers(0, 13, n)[:, None]] = np.nan
+    return index, inflation
+
+
+def _ecb_frame(code, periods, values, item="000000", title="HICP - Overall index"):
+    ref = ECB_REF_AREAS.get(code, code)
+    present = ~np.isnan(values)
+    frame = pd.DataFrame({col: "" for col in ECB_COLUMNS}, index=range(len(periods)))
+    frame["KEY"] = f"ICP.M.{ref}.N.{item}.4.INX"
+    frame["FREQ"], frame["REF_AREA"], frame["ADJUSTMENT"] = "M", ref, "N"
+    frame["ICP_ITEM"], frame["STS_INSTITUTION"], frame["ICP_SUFFIX"] = item, "4", "INX"
+    frame["TIME_PERIOD"] = periods
+    frame["OBS_VALUE"] = values
+    frame["OBS_STATUS"] = np.where(present, "A", "")
+    frame["OBS_CONF"] = np.where(present, "F", "")
+    frame["OBS_COM"] = np.where(present, "", "ECB estimate")
+    frame["TIME_FORMAT"], frame["COLLECTION"] = "P1M", "A"
+    frame["DOM_SER_IDS"] = f"ICPT.M.VAL.HICP.INDEX.{ref}.00.M"
+    frame["UNIT_INDEX_BASE"], frame["DECIMALS"] = "2015 = 100", "2"
+    frame["TITLE"] = title
+    frame["TITLE_COMPL"] = f"{code} - {title}, Index, Eurostat, Neither seasonally nor working day adjusted"
+    frame["UNIT"], frame["UNIT_MULT"] = "PURE_NUMB", "0"
+    return frame
+
+
+def write_hicp(data_dir, codes, years, items, sub_index_countries, rng):
+    months = years * 12
+    periods = pd.period_range(f"{END_YEAR - years + 1}-01", f"{END_YEAR}-12", freq="M").astype(str)
+    dates = np.char.add(np.asarray(periods, dtype=str), "-01")
+    values, inflation = hicp_values(rng, len(codes), months)
+
+    cleaned = []
+    for code, row in zip(codes, values):
+        _ecb_frame(code, periods, row).to_csv(os.path.join(data_dir, f"ecb_hicp_{code}.csv"), index=False)
+        present = ~np.isnan(row)
+        cleaned.append(pd.DataFrame({"date": dates[present], "hicp_index": row[present], "region": code}))
+    hicp = pd.concat(cleaned, ignore_index=True)
+    hicp.to_csv(os.path.join(data_dir, "cleaned_ecb_hicp_all.csv"), index=False)
+
+    sub_rows = 0
+    if items:
+        path = os.path.join(data_dir, "ecb_hicp_coicop.csv")
+        item_list = coicop_items(items)
+        for i, code in enumerate(codes[:sub_index_countries]):
+            # Each sub-index drifts around its country's overall inflation
+            sub_values, _ = hicp_values(rng, items, months, inflation[i] + rng.normal(0, 0.01, items))
+            frames = [_ecb_frame(code, periods, sub_values[j], item, title) for j, (item, title) in enumerate(item_list)]
+            pd.concat(frames).to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            sub_rows += items * months
+    return len(hicp), sub_rows
+
+
+# --- Population -------------------------------------------------------------
+
+def population_values(rng, n, years):
+    """(n, years) total population, NaN before each series starts."""
+    latest = np.clip(rng.lognormal(np.log(5e6), 1.5, n), 2e4, 1.5e8)
+    values = _walk(latest, rng.normal(0.004, 0.006, (n, years))).round()
+    values[np.arange(years)[None, :] < _late_starts(rng, n, years, 0.3)[:, None]] = np.nan
+    return values
+
+
+def write_population(data_dir, codes, years, ages, rng):
+    year_labels = list(range(END_YEAR - years + 1, END_YEAR + 1))
+    total = population_values(rng, len(codes), years)
+    male = (total * rng.uniform(0.48, 0.5, (len(codes), 1))).round()
+    by_sex = {"T": total, "M": male, "F": total - male}
+    shares = rng.dirichlet(np.ones(ages), len(codes)) if ages else np.empty((len(codes), 0))
+    age_codes = ["TOTAL"] + [f"Y{5 * k}-{5 * k + 4}" for k in range(ages)]
+    flags = np.where(np.arange(years) == years - 1, "p", "")[None, :].repeat(len(codes), axis=0)
+
+    header = "freq,unit,age,sex,geo\\TIME_PERIOD\t" + "\t".join(f"{y} " for y in year_labels)
+    keys, cells = [], []
+    for a, age in enumerate(age_codes):
+        for sex, values in by_sex.items():
+            block = values if a == 0 else (values * shares[:, a - 1:a]).round()
+            keys += [f"A,NR,{age},{sex},{code}" for code in codes]
+            cells.append(np.char.replace(_tsv_cells(block, flags), ".0", ""))
+    _write_tsv(os.path.join(data_dir, "demo_pjan.tsv.gz"), header, keys, np.concatenate(cells), gzip.open)
+
+    rows, cols = np.nonzero(~np.isnan(total))
+    cleaned = pd.DataFrame({
+        "region": np.asarray(codes)[rows],
+        "year": np.asarray(year_labels)[cols],
+        "population": total[rows, cols].astype(np.int64),
+    })
+    cleaned.to_csv(os.path.join(data_dir, "cleaned_population.csv"), index=False)
+    return len(cleaned)
+
+
+def generate(out, countries, years, items=12, ages=5, sub_index_countries=SUB_INDEX_COUNTRIES, seed=0):
+    """
+    Write the raw and cleaned files for `countries` x `years` under
+    <out>/data/ and return the row count of each dataset.
+    """
+    data_dir = os.path.join(out, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    codes = country_codes(countries)
+
+    counts = {"gdp": write_gdp(data_dir, codes, years, rng)}
+    counts["hicp"], counts["hicp_sub_indices"] = write_hicp(data_dir, codes, years, items, sub_index_countries, rng)
+    counts["population"] = write_population(data_dir, codes, years, ages, rng)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic EuroMetrics data in the formats of data/.")
+    parser.add_argument("--countries", type=int, default=3)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--items", type=int, default=12, help="COICOP sub-indices per country")
+    parser.add_argument("--ages", type=int, default=5, help="age groups in demo_pjan besides TOTAL")
+    parser.add_argument("--sub-index-countries", type=int, default=SUB_INDEX_COUNTRIES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=os.path.join("bench_data", "synthetic"))
+    args = parser.parse_args()
+
+    counts = generate(args.out, args.countries, args.years, args.items, args.ages, args.sub_index_countries, args.seed)
+    for dataset, rows in counts.items():
+        print(f"✅ {dataset}: {rows:,} rows")
+    print(f"✅ Files written to {os.path.join(args.out, 'data')}")
+
+
+if __name__ == "__main__":
+    main()
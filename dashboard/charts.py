@@ -0,0 +1,109 @@
+# dashboard/charts.py
+#
+# Plotly figures shared by the pages, in the dashboard's EU theme. Building
+# a figure with plotly express costs far more than sending it, so every
+# builder is cached per process on its arguments: the chart's own settings
+# plus a `key` naming the data it is drawn from (data_access.filter_key(),
+# i.e. the filters and the data version). The frame itself is passed as
+# `_df`, which Streamlit does not hash; a figure is rebuilt only when the
+# key or a setting changes, not on reruns caused by unrelated widgets.
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard.data_access import QUERY_TTL
+from dashboard.downsample import downsample
+
+EU_BLUE = "#003399"
+EU_COLORS = ['#003399', '#FFDD00', '#CC0000', '#009900', '#FF6600', '#9900CC', '#00CCCC']
+
+# Figures kept per process (a few tens of KB each), shared by all sessions
+FIGURE_CACHE_ENTRIES = 256
+
+_figure_cache = st.cache_resource(ttl=QUERY_TTL, max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+
+
+def style(fig, height, background=True, **layout):
+    """Apply the EU theme (blue titles, light plot background) and any extra layout settings."""
+    if background:
+        layout.update(plot_bgcolor='rgba(248,249,255,0.8)', paper_bgcolor='rgba(0,0,0,0)')
+    fig.update_layout(height=height, title_font_color=EU_BLUE, **layout)
+    return fig
+
+
+def _colors(color):
+    # One series: EU blue; one per group: the EU palette; numeric colours: Blues
+    return {
+        "color_discrete_sequence": EU_COLORS if color else [EU_BLUE],
+        "color_continuous_scale": "Blues",
+    }
+
+
+@_figure_cache
+def line(_df, key, x, y, title, color=None, markers=True, height=400, points=None, **layout):
+    """
+    Line per `color` group. With `points`, longer series are cut to that many
+    points with LTTB (dashboard/downsample.py) and drawn without markers.
+    """
+    if points:
+        plotted = downsample(_df, x, y, by=color, points=points)
+        markers = markers and plotted is _df
+        _df = plotted
+    fig = px.line(_df, x=x, y=y, color=color, title=title, markers=markers,
+                  color_discrete_sequence=EU_COLORS if color else [EU_BLUE])
+    return style(fig, height, **layout)
+
+
+@_figure_cache
+def bar(_df, key, x, y, title, color=None, height=400, **layout):
+    fig = px.bar(_df, x=x, y=y, color=color, title=title, **_colors(color))
+    return style(fig, height, **layout)
+
+
+@_figure_cache
+def box(_df, key, x, y, title, height=400, **layout):
+    fig = px.box(_df, x=x, y=y, title=title, color_discrete_sequence=EU_COLORS)
+    return style(fig, height, **layout)
+
+
+@_figure_cache
+def histogram(_df, key, x, title, nbins=30, height=400, **layout):
+    fig = px.histogram(_df, x=x, title=title, nbins=nbins, color_discrete_sequence=[EU_BLUE])
+    return style(fig, height, **layout)
+
+
+@_figure_cache
+def scatter(_df, key, x, y, title, color=None, size=None, height=450, **layout):
+    if size is not None:
+        # Plotly rejects NaN marker sizes
+        _df = _df.dropna(subset=[size])
+    fig = px.scatter(_df, x=x, y=y, color=color, size=size, title=title, **_colors(color))
+    return style(fig, height, **layout)
+
+
+@_figure_cache
+def heatmap(_df, key, title, text_auto=False, height=500, **layout):
+    """`_df` laid out as a grid (index x columns), e.g. a pivot table or a correlation matrix."""
+    fig = px.imshow(_df, text_auto=text_auto, aspect="auto", title=title, color_continuous_scale="Blues")
+    return style(fig, height, background=False, **layout)
+
+
+@_figure_cache
+def rates(_monthly, key, y, average, title, height=450, points=None, **layout):
+    """
+    Monthly `y` per country, each with its `average` column drawn dotted in
+    the same colour; both downsampled to `points` per series if given.
+    """
+    lines = downsample(_monthly, "month", y, by="country", points=points) if points else _monthly
+    fig = px.line(lines, x="month", y=y, color="country", title=title, color_discrete_sequence=EU_COLORS)
+    for i, (country, group) in enumerate(_monthly.groupby("country", sort=False)):
+        if points:
+            group = downsample(group, "month", average, points=points)
+        fig.add_trace(go.Scatter(
+            x=group["month"],
+            y=group[average],
+            name=f"{country} 12-month average",
+            line=dict(dash="dot", color=EU_COLORS[i % len(EU_COLORS)])
+        ))
+    return style(fig, height, **layout)
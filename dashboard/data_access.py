@@ -0,0 +1,271 @@
+# dashboard/data_access.py
+
+import os
+from contextlib import contextmanager
+
+import pandas as pd
+import psycopg2
+import streamlit as st
+from psycopg2.pool import ThreadedConnectionPool
+
+from dashboard import duckdb_backend, filters, profile, search
+
+# Same variable the ingestion pipeline reads; SQLAlchemy-style URLs are accepted
+DATABASE_URL_ENV = "EUROMETRICS_DATABASE_URL"
+DEFAULT_DATABASE_URL = "postgresql://postgres@localhost:5432/eurometrics"
+
+# "postgres" reads the tables dbt built on the server; "duckdb" builds the
+# same models in-process from the files in data/ (dashboard/duckdb_backend.py)
+BACKEND_ENV = "EUROMETRICS_BACKEND"
+BACKENDS = ("postgres", "duckdb")
+DEFAULT_BACKEND = "postgres"
+
+# Streamlit serves every session from a thread of one process, so one pool
+# bounded by EUROMETRICS_DB_POOL_MAX is shared by all of them
+POOL_MIN_ENV, POOL_MAX_ENV = "EUROMETRICS_DB_POOL_MIN", "EUROMETRICS_DB_POOL_MAX"
+DEFAULT_POOL_MIN, DEFAULT_POOL_MAX = 1, 10
+
+# Cached query results are reused for this long (seconds) even if no new
+# load is recorded, e.g. when the ingestion log does not exist yet
+QUERY_TTL = 600
+
+# How often (seconds) the process checks ingestion_log for a newer load;
+# every cached result below is keyed on the version it returns
+VERSION_POLL_INTERVAL = 30
+
+# In-memory dtypes of the indicators frame: country codes as a category,
+# years as int16 and NUMERIC columns as native floats rather than Decimal
+# objects. float32 (7 significant digits) is enough for index values and
+# per-capita figures; totals that run into the millions stay float64.
+INDICATOR_DTYPES = {
+    "country": "category",
+    "year": "int16",
+    "gdp_eur_millions": "float64",
+    "avg_hicp_index": "float32",
+    "population": "float64",
+    "gdp_per_capita": "float32",
+}
+INDICATOR_COLUMNS = list(INDICATOR_DTYPES)
+
+HICP_MONTHLY_COLUMNS = [
+    "country", "month", "year", "hicp_index",
+    "mom_rate_pct", "yoy_rate_pct", "avg_12m_yoy_rate_pct", "avg_12m_index",
+]
+
+
+def database_dsn():
+    """libpq connection string from EUROMETRICS_DATABASE_URL (the +psycopg2 driver suffix is dropped)."""
+    url = os.environ.get(DATABASE_URL_ENV, DEFAULT_DATABASE_URL)
+    return url.replace("postgresql+psycopg2://", "postgresql://", 1)
+
+
+def backend():
+    """Configured backend, one of BACKENDS."""
+    name = os.environ.get(BACKEND_ENV, DEFAULT_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"{BACKEND_ENV}={name!r}; expected one of {BACKENDS}")
+    return name
+
+
+@st.cache_resource
+def get_pool():
+    return ThreadedConnectionPool(
+        int(os.environ.get(POOL_MIN_ENV, DEFAULT_POOL_MIN)),
+        int(os.environ.get(POOL_MAX_ENV, DEFAULT_POOL_MAX)),
+        database_dsn(),
+    )
+
+
+@contextmanager
+def connection():
+    """Borrow a pooled connection; it is rolled back and returned (or dropped if broken) afterwards."""
+    pool = get_pool()
+    conn = pool.getconn()
+    broken = False
+    try:
+        yield conn
+    except psycopg2.OperationalError:
+        # Server restarts or dropped sockets: don't hand this connection out again
+        broken = True
+        raise
+    finally:
+        if not conn.closed and not broken:
+            conn.rollback()
+        pool.putconn(conn, close=broken or bool(conn.closed))
+
+
+@st.cache_resource(max_entries=1, show_spinner="Building the DuckDB models...")
+def get_duckdb(version):
+    """In-memory DuckDB database with the dbt models built from data/; rebuilt when `version` changes."""
+    return duckdb_backend.build_database()
+
+
+# What read_query raises when a table does not exist (e.g. dbt has not built it yet)
+MISSING_TABLE_ERRORS = (psycopg2.errors.UndefinedTable,) + (
+    (duckdb_backend.duckdb.CatalogException,) if duckdb_backend.duckdb else ()
+)
+
+
+def read_query(query, params=None):
+    """Run a parameterised query on the configured backend and return the result as a DataFrame."""
+    if backend() == "duckdb":
+        return duckdb_backend.read_query(get_duckdb(data_version()), query, params)
+    with connection() as conn, conn.cursor() as cur:
+        cur.execute(query, params)
+        columns = [desc[0] for desc in cur.description]
+        # coerce_float turns NUMERIC's Decimal values into floats
+        return pd.DataFrame.from_records(cur.fetchall(), columns=columns, coerce_float=True)
+
+
+def apply_schema(df, dtypes):
+    """
+    Cast the columns of `df` named in `dtypes`. Numeric targets go through
+    pd.to_numeric first, so object columns of Decimal / None become float
+    arrays with NaN.
+    """
+    out = {}
+    for col in df.columns:
+        dtype = dtypes.get(col)
+        if dtype is None or dtype == "category":
+            out[col] = df[col] if dtype is None else df[col].astype(dtype)
+        else:
+            out[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+    return pd.DataFrame(out, index=df.index)
+
+
+@st.cache_data(ttl=VERSION_POLL_INTERVAL, show_spinner=False)
+def data_version():
+    """
+    Time of the latest load recorded in ingestion_log by the loaders and the
+    dbt models, as an ISO string; None if nothing has been recorded yet.
+    With the DuckDB backend, the newest modification time of its source
+    files and models instead.
+    """
+    if backend() == "duckdb":
+        return duckdb_backend.data_version()
+    try:
+        stamp = read_query("SELECT max(loaded_at) AS loaded_at FROM ingestion_log")["loaded_at"].iloc[0]
+    except psycopg2.errors.UndefinedTable:
+        return None
+    return None if pd.isna(stamp) else pd.Timestamp(stamp).isoformat()
+
+
+def current_filters():
+    """
+    (countries, year_range) chosen in the Overview sidebar, as hashable
+    tuples; None for either means no restriction (e.g. a page opened directly).
+    """
+    countries = st.session_state.get("selected_countries") or None
+    year_range = st.session_state.get("year_range")
+    return (
+        tuple(countries) if countries else None,
+        tuple(int(y) for y in year_range) if year_range else None,
+    )
+
+
+@st.cache_resource(ttl=QUERY_TTL, max_entries=1, show_spinner="Loading indicators...")
+def _indicator_snapshot(version):
+    # Sorted by (country, year), the order dashboard/filters.py slices on
+    df = read_query(f"SELECT {', '.join(INDICATOR_COLUMNS)} FROM core_economic_indicators ORDER BY country, year")
+    if df.empty:
+        df = pd.DataFrame(columns=INDICATOR_COLUMNS)
+    return apply_schema(df, INDICATOR_DTYPES)
+
+
+def get_indicators():
+    """
+    The whole core_economic_indicators table. One copy per process is shared
+    by every session (cache_resource hands out the object itself, not a
+    copy), so treat it as read-only. A newer ingestion_log stamp replaces it.
+    """
+    return _indicator_snapshot(data_version())
+
+
+@st.cache_resource(ttl=QUERY_TTL, max_entries=1, show_spinner=False)
+def _filter_index(version):
+    return filters.build_index(_indicator_snapshot(version))
+
+
+def load_filter_options():
+    """One row per country with the first and last year available, for the sidebar widgets."""
+    return filters.year_bounds(_filter_index(data_version()))
+
+
+@st.cache_resource(ttl=QUERY_TTL, max_entries=256, show_spinner=False)
+def _indicator_slice(countries, year_range, version):
+    return filters.select(_filter_index(version), countries, year_range)
+
+
+def load_indicators(countries=None, year_range=None):
+    """
+    Rows of core_economic_indicators for `countries` (None = all) within
+    `year_range` (inclusive, None = all years), sliced from the shared
+    snapshot through its (country, year) offsets (dashboard/filters.py).
+    Slices are memoised per filter key and shared read-only like the
+    snapshot itself.
+    """
+    return _indicator_slice(countries, year_range, data_version())
+
+
+@st.cache_resource(ttl=QUERY_TTL, max_entries=64, show_spinner=False)
+def _profile(countries, year_range, version):
+    return profile.build_profile(_indicator_slice(countries, year_range, version))
+
+
+def load_profile(countries=None, year_range=None):
+    """Profile (dashboard/profile.py) of the selection, computed once per filters and data version."""
+    return _profile(countries, year_range, data_version())
+
+
+def filter_key(countries=None, year_range=None):
+    """Hashable name for the data of a selection: the filters plus the data version (see dashboard/charts.py)."""
+    return countries, year_range, data_version()
+
+
+def latest_year(countries=None, year_range=None):
+    """Most recent year with data for the selection (None if there is none)."""
+    return filters.latest_year(_filter_index(data_version()), countries, year_range)
+
+
+@st.cache_resource(ttl=QUERY_TTL, max_entries=2 * len(INDICATOR_COLUMNS), show_spinner=False)
+def _search_index(column, version):
+    return search.build_index(_indicator_snapshot(version)[column])
+
+
+def search_indicators(column, term):
+    """
+    Rows of the whole table whose `column` matches `term`: a case-insensitive
+    substring for text, a number or range (10..20, >=10) for numbers. Raises
+    ValueError for a malformed numeric term.
+    """
+    version = data_version()
+    positions = search.search(_search_index(column, version), term)
+    return _indicator_snapshot(version).iloc[positions]
+
+
+@st.cache_resource(ttl=QUERY_TTL, max_entries=64, show_spinner=False)
+def _hicp_monthly(countries, start_year, end_year, version):
+    query = f"""
+        SELECT {", ".join(HICP_MONTHLY_COLUMNS)}
+        FROM core_hicp_monthly
+        WHERE country = ANY(%(countries)s)
+          AND month >= make_date(%(start_year)s, 1, 1)
+          AND month <  make_date(%(end_year)s + 1, 1, 1)
+        ORDER BY country, month
+    """
+    df = read_query(query, {"countries": list(countries), "start_year": int(start_year), "end_year": int(end_year)})
+    if df.empty:
+        return pd.DataFrame(columns=HICP_MONTHLY_COLUMNS)
+    df["month"] = pd.to_datetime(df["month"])
+    return df
+
+
+def load_hicp_monthly(countries, start_year, end_year):
+    """
+    Monthly HICP rows from core_hicp_monthly for `countries` between
+    `start_year` and `end_year` (inclusive). The filter matches the
+    (country, month) index, so this is one index range scan. Results are
+    cached per selection and data version and shared read-only; errors are
+    raised, not cached.
+    """
+    return _hicp_monthly(tuple(countries), int(start_year), int(end_year), data_version())
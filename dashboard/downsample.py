@@ -0,0 +1,76 @@
+# dashboard/downsample.py
+#
+# Largest-Triangle-Three-Buckets downsampling for the line charts: each
+# series is cut to a point budget that matches the chart's width, keeping
+# the points that shape the line (peaks, troughs, turns). Series already
+# within the budget - e.g. after narrowing the year range - are plotted at
+# full resolution.
+
+import numpy as np
+import pandas as pd
+
+# A full-width chart on the wide layout is ~1,200 px across; more than one
+# point per two pixels is not visible
+CHART_WIDTH_PX = 1200
+PIXELS_PER_POINT = 2
+
+
+def point_budget(width_fraction=1.0):
+    """Points per series for a chart spanning `width_fraction` of the page."""
+    return max(3, int(CHART_WIDTH_PX * width_fraction / PIXELS_PER_POINT))
+
+
+def lttb(x, y, threshold):
+    """
+    Positions of the `threshold` points of (x, y) chosen by LTTB; x must be
+    ascending. The first and last points are always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket i covers [edges[i], edges[i + 1]) of the inner points 1 .. n-2
+    buckets = threshold - 2
+    edges = 1 + (np.arange(buckets + 1) * (n - 2)) // buckets
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    # The third corner of bucket i's triangles is the mean of bucket i + 1
+    # (the last point for the last bucket); those don't depend on the choice
+    sizes = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1)[1:] / sizes[1:], x[-1])
+    avg_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1)[1:] / sizes[1:], y[-1])
+
+    a = 0
+    for i in range(buckets):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(df, x, y, by=None, points=None):
+    """
+    Rows of `df` kept when each series (one per `by` value) of `y` against
+    `x` is reduced to at most `points` points with LTTB. Rows with a missing
+    `y` are dropped from series that need reducing. Returns `df` unchanged
+    when every series fits.
+    """
+    points = points or point_budget()
+    groups = [(None, df)] if by is None else df.groupby(by, sort=False, observed=True)
+    if all(len(group) <= points for _, group in groups):
+        return df
+
+    parts = []
+    for _, group in groups:
+        if len(group) > points:
+            group = group.dropna(subset=[y]).sort_values(x)
+            xs = group[x]
+            if pd.api.types.is_datetime64_any_dtype(xs):
+                xs = xs.astype("int64")
+            group = group.iloc[lttb(xs.to_numpy(), group[y].to_numpy(), points)]
+        parts.append(group)
+    return pd.concat(parts)
@@ -0,0 +1,136 @@
+# dashboard/duckdb_backend.py
+#
+# Embedded DuckDB backend (EUROMETRICS_BACKEND=duckdb). Instead of querying
+# the tables dbt built in PostgreSQL, it builds the same staging and core
+# models in-process: the dbt sources become views over the files in data/
+# (the Parquet zone if it exists, else the cleaned CSVs) and the model SQL in
+# eurometrics_dbt/models is rendered and run against them. No database server
+# or network is involved, so the dashboard also runs offline.
+
+import os
+import re
+from datetime import datetime, timezone
+
+import jinja2
+
+from data_ingestion.parquet_store import CLEANED_CSVS, dataset_path, has_dataset
+
+try:
+    import duckdb
+except ImportError:  # optional; only needed with EUROMETRICS_BACKEND=duckdb
+    duckdb = None
+
+DBT_MODELS_DIR = os.path.join("eurometrics_dbt", "models")
+
+# dbt source table -> dataset in data_ingestion/parquet_store.py
+SOURCES = {
+    "gdp_eurostat": "gdp",
+    "hicp_inflation": "hicp",
+    "population_data": "population",
+}
+
+# Models in dependency order
+MODELS = [
+    "staging/stg_gdp_eurostat",
+    "staging/stg_hicp_inflation",
+    "staging/stg_population",
+    "core/core_economic_indicators",
+    "core/core_hicp_monthly",
+    "core/core_indicator_rollup",
+]
+
+# psycopg2's %(name)s placeholders, rewritten to DuckDB's $name
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s")
+
+
+def source_files(dataset):
+    """Files a source is read from: every Parquet part if the dataset has been converted, else its CSV."""
+    if has_dataset(dataset, "cleaned"):
+        root = dataset_path(dataset, "cleaned")
+        return sorted(
+            os.path.join(folder, name)
+            for folder, _, names in os.walk(root)
+            for name in names if name.endswith(".parquet")
+        )
+    return [CLEANED_CSVS[dataset]]
+
+
+def _model_path(model):
+    return os.path.join(DBT_MODELS_DIR, f"{model}.sql")
+
+
+def data_version():
+    """
+    Modification time of the newest source file or model, as an ISO string;
+    None if none exists. Plays the role ingestion_log has for PostgreSQL: a
+    new value means the models must be rebuilt.
+    """
+    paths = [path for dataset in SOURCES.values() for path in source_files(dataset)]
+    paths += [_model_path(model) for model in MODELS]
+    stamps = [os.path.getmtime(path) for path in paths if os.path.exists(path)]
+    return datetime.fromtimestamp(max(stamps), timezone.utc).isoformat() if stamps else None
+
+
+def _source_scan(dataset):
+    if has_dataset(dataset, "cleaned"):
+        # One glob instead of every part's path; region=<code> directories
+        # supply the partition column
+        pattern = os.path.join(dataset_path(dataset, "cleaned"), "**", "*.parquet")
+        return f"read_parquet({pattern!r}, hive_partitioning = true)"
+    return f"read_csv({CLEANED_CSVS[dataset]!r}, header = true)"
+
+
+def render_model(model):
+    """
+    (materialization, SQL) of a dbt model: config() is recorded, ref() and
+    source() resolve to the relations created here, and incremental models
+    render their full-refresh branch.
+    """
+    settings = {}
+
+    def config(**kwargs):
+        settings.update(kwargs)
+        return ""
+
+    name = os.path.basename(model)
+    with open(_model_path(model), encoding="utf-8") as f:
+        sql = jinja2.Environment().from_string(f.read()).render(
+            config=config,
+            ref=lambda relation: relation,
+            source=lambda source_name, table: table,
+            is_incremental=lambda: False,
+            this=name,
+        )
+    return settings.get("materialized", "view"), sql
+
+
+def build_database(database=":memory:"):
+    """
+    Connect to `database` (in memory by default) and build every model in
+    MODELS: views stay views, tables and incremental models become tables.
+    """
+    if duckdb is None:
+        raise ImportError("EUROMETRICS_BACKEND=duckdb needs the duckdb package: pip install duckdb")
+    con = duckdb.connect(database)
+    for table, dataset in SOURCES.items():
+        # The loaders stamp loaded_at per row; here every row is as new as its files
+        loaded_at = max(os.path.getmtime(path) for path in source_files(dataset))
+        con.execute(
+            f"CREATE OR REPLACE VIEW {table} AS "
+            f"SELECT *, to_timestamp({loaded_at}) AS loaded_at FROM {_source_scan(dataset)}"
+        )
+    for model in MODELS:
+        materialized, sql = render_model(model)
+        kind = "VIEW" if materialized == "view" else "TABLE"
+        con.execute(f"CREATE OR REPLACE {kind} {os.path.basename(model)} AS {sql}")
+    return con
+
+
+def read_query(con, query, params=None):
+    """
+    Run a query written for data_access.read_query (psycopg2 placeholders)
+    on `con` and return a DataFrame. Each call takes its own cursor, so one
+    connection can be shared by every session thread.
+    """
+    with con.cursor() as cur:
+        return cur.execute(_PLACEHOLDER.sub(r"$\1", query), params).df()
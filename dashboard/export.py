@@ -0,0 +1,73 @@
+# dashboard/export.py
+#
+# File downloads for the Data Explorer. st.download_button is given a
+# zero-argument callable, so a file is only generated when the button is
+# clicked; it is written chunk by chunk from the cached frame and the result
+# is cached per (data key, format), so reruns never pay for it.
+
+import gzip
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from dashboard.data_access import QUERY_TTL
+
+# label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "CSV (gzip)": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+# Rows serialised per chunk; bounds the temporary text / Arrow buffers
+EXPORT_CHUNK_ROWS = 100_000
+
+# Generated files kept per process
+EXPORT_CACHE_ENTRIES = 8
+
+
+def _chunks(df, order, columns, chunk_rows):
+    for start in range(0, max(len(order), 1), chunk_rows):
+        yield df.iloc[order[start:start + chunk_rows]][list(columns)]
+
+
+def _write_csv(chunks, out):
+    for i, chunk in enumerate(chunks):
+        out.write(chunk.to_csv(index=False, header=i == 0).encode("utf-8"))
+
+
+def _write_parquet(chunks, out):
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            # One row group per chunk
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+@st.cache_resource(ttl=QUERY_TTL, max_entries=EXPORT_CACHE_ENTRIES, show_spinner=False)
+def export_file(_df, _order, key, columns, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Bytes of `columns` of `_df`, rows taken in `_order`, in format `fmt` (a
+    key of EXPORT_FORMATS). `key` must name the data and its order, since
+    the frame and the order are not hashed.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(EXPORT_FORMATS)}")
+    chunks = _chunks(_df, _order, columns, chunk_rows)
+    out = io.BytesIO()
+    if fmt == "Parquet":
+        _write_parquet(chunks, out)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=out, mode="wb") as gz:
+            _write_csv(chunks, gz)
+    else:
+        _write_csv(chunks, out)
+    return out.getvalue()
@@ -0,0 +1,94 @@
+# dashboard/filters.py
+#
+# Answers the sidebar's country / year selections by slicing the indicators
+# frame instead of masking it. The frame is kept sorted by (country, year),
+# so every country is one contiguous block of rows and a year range inside
+# it is a binary search; a selection costs O(countries x log rows) plus the
+# rows it returns, however large the table grows.
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# frame:   the rows, sorted by (country, year)
+# offsets: one row per country with its [start, stop) row positions and its
+#          first / last year
+# keys:    country code * span + (year - base_year) for every row, ascending,
+#          so (country, year) bounds map to row positions with searchsorted
+FilterIndex = namedtuple("FilterIndex", ["frame", "offsets", "keys", "base_year", "span"])
+
+
+def build_index(df, region_col="country"):
+    """Sort `df` by (country, year) if needed and build its FilterIndex."""
+    if not df.set_index([region_col, "year"]).index.is_monotonic_increasing:
+        df = df.sort_values([region_col, "year"], kind="stable", ignore_index=True)
+
+    countries = df[region_col].to_numpy()
+    years = df["year"].to_numpy().astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, countries[1:] != countries[:-1]]) if len(df) else np.array([], dtype=np.int64)
+    stops = np.r_[starts[1:], len(df)].astype(np.int64)
+    offsets = pd.DataFrame({
+        "start": starts,
+        "stop": stops,
+        "min_year": years[starts],
+        "max_year": years[stops - 1],
+    }, index=pd.Index(countries[starts], name=region_col))
+
+    base_year = int(years.min()) if len(df) else 0
+    span = int(years.max()) - base_year + 1 if len(df) else 1
+    codes = np.repeat(np.arange(len(starts), dtype=np.int64), stops - starts)
+    keys = codes * span + (years - base_year)
+    return FilterIndex(df, offsets, keys, base_year, span)
+
+
+def run_positions(starts, stops):
+    """Positions covered by the [start, stop) runs, in order, without a Python-level loop."""
+    lengths = stops - starts
+    ends = np.cumsum(lengths)
+    return np.repeat(starts - ends + lengths, lengths) + np.arange(ends[-1] if len(ends) else 0)
+
+
+def _bounds(index, countries, year_range):
+    """[start, stop) row positions of each selected country's rows inside `year_range`."""
+    offsets = index.offsets
+    if countries is None:
+        codes = np.arange(len(offsets), dtype=np.int64)
+    else:
+        codes = offsets.index.get_indexer(pd.Index(list(countries)).unique())
+        codes = np.sort(codes[codes >= 0]).astype(np.int64)
+    if year_range is None:
+        return offsets["start"].to_numpy()[codes], offsets["stop"].to_numpy()[codes]
+
+    # Clamp to the table's years so the offsets cannot spill into a neighbouring country
+    first = min(max(int(year_range[0]), index.base_year), index.base_year + index.span)
+    last = max(min(int(year_range[1]), index.base_year + index.span - 1), index.base_year - 1)
+    starts = np.searchsorted(index.keys, codes * index.span + (first - index.base_year), side="left")
+    stops = np.searchsorted(index.keys, codes * index.span + (last - index.base_year), side="right")
+    return starts, np.maximum(starts, stops)
+
+
+def select(index, countries=None, year_range=None):
+    """
+    Rows for `countries` (None = all) within `year_range` (inclusive, None =
+    all years), in (country, year) order. The whole selection returns the
+    indexed frame itself, not a copy.
+    """
+    starts, stops = _bounds(index, countries, year_range)
+    if len(starts) == len(index.offsets) and (stops - starts).sum() == len(index.frame):
+        return index.frame
+    return index.frame.iloc[run_positions(starts, stops)].reset_index(drop=True)
+
+
+def latest_year(index, countries=None, year_range=None):
+    """Most recent year with rows for the selection, or None if it is empty."""
+    starts, stops = _bounds(index, countries, year_range)
+    found = stops > starts
+    if not found.any():
+        return None
+    return int(index.frame["year"].to_numpy()[stops[found] - 1].max())
+
+
+def year_bounds(index):
+    """Per-country first and last year (country, min_year, max_year), for the sidebar widgets."""
+    return index.offsets[["min_year", "max_year"]].reset_index()
@@ -0,0 +1,39 @@
+# dashboard/pagination.py
+#
+# Sorted, paginated table views. The sort order of a frame is computed once
+# per (data key, column, direction) and cached; a page is then a slice of
+# that order, so page turns cost O(page size) however many rows the table
+# has and only the visible rows are sent to the browser.
+
+import numpy as np
+import streamlit as st
+
+from dashboard.data_access import QUERY_TTL
+
+PAGE_SIZES = [25, 50, 100, 500]
+
+# Each entry holds one row position per row (int32 up to 2**31 rows)
+SORT_CACHE_ENTRIES = 16
+
+
+@st.cache_resource(ttl=QUERY_TTL, max_entries=SORT_CACHE_ENTRIES, show_spinner=False)
+def sort_order(_df, key, column, ascending=True):
+    """
+    Row positions of `_df` ordered by `column`: a stable sort with missing
+    values last, as DataFrame.sort_values. `key` names the data (see
+    data_access.filter_key), since the frame itself is not hashed.
+    """
+    values = _df[column].reset_index(drop=True)
+    order = values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+    return order.astype(np.int32) if len(order) < 2**31 else order
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def get_page(df, order, page, page_size, columns=None):
+    """Rows on `page` (1-based) of `df` taken in `order`, limited to `columns`."""
+    start = (page - 1) * page_size
+    rows = df.iloc[order[start:start + page_size]]
+    return rows if columns is None else rows[columns]
@@ -0,0 +1,51 @@
+# dashboard/profile.py
+#
+# Dataset profile for the Data Explorer: schema, null counts, completeness,
+# distinct counts and describe() of the numeric columns, computed in one
+# pass over the frame. The page reads it from a cache keyed by the filters
+# and data version (data_access.load_profile), so reruns cost nothing.
+
+from collections import namedtuple
+
+import pandas as pd
+
+# rows / n_columns:  table size
+# columns:           Column, Data Type, Non-Null Count, Null Count per column
+# completeness:      non-null cells as a percentage of all cells
+# missing:           Column, Missing Count, Missing Percentage for columns with nulls
+# unique:            distinct values per column
+# year_span:         last year - first year + 1 (0 if empty)
+# describe:          DataFrame.describe() of every numeric column
+Profile = namedtuple(
+    "Profile",
+    ["rows", "n_columns", "columns", "completeness", "missing", "unique", "year_span", "describe"],
+)
+
+
+def build_profile(df):
+    """Profile of `df`; every statistic comes from one count / nunique / describe pass."""
+    rows = len(df)
+    non_null = df.count()
+    nulls = rows - non_null
+
+    columns = pd.DataFrame({
+        'Column': df.columns,
+        'Data Type': df.dtypes.astype(str),
+        'Non-Null Count': non_null,
+        'Null Count': nulls,
+    })
+    total_cells = rows * len(df.columns)
+    completeness = (non_null.sum() / total_cells * 100) if total_cells else 0.0
+
+    missing = nulls[nulls > 0].sort_values(ascending=False)
+    missing = pd.DataFrame({
+        'Column': missing.index,
+        'Missing Count': missing.values,
+        'Missing Percentage': (missing.values / rows * 100).round(2),
+    })
+
+    numeric = df.select_dtypes(include=['number'])
+    describe = numeric.describe() if len(numeric.columns) else pd.DataFrame()
+    year_span = int(df['year'].max() - df['year'].min() + 1) if 'year' in df and rows else 0
+
+    return Profile(rows, len(df.columns), columns, completeness, missing, df.nunique(), year_span, describe)
@@ -0,0 +1,170 @@
+# dashboard/rollup.py
+#
+# Answers the pages' summary tables and heatmaps from core_indicator_rollup
+# (country / year / decade aggregates) instead of re-grouping the base frame.
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard.data_access import MISSING_TABLE_ERRORS, QUERY_TTL, data_version, get_indicators, read_query
+
+METRICS = ["gdp_eur_millions", "gdp_per_capita", "avg_hicp_index", "population"]
+
+DIMENSIONS = ["country", "year", "decade"]
+
+# Grouping sets materialised by the model, keyed by their dimensions
+GRAINS = {
+    ("country", "year"): "country_year",
+    ("country", "decade"): "country_decade",
+    ("country",): "country",
+    ("year",): "year",
+    ("decade",): "decade",
+    (): "all",
+}
+
+
+def load_rollup():
+    """Read the whole rollup table (a few rows per country and year)."""
+    df = read_query("SELECT * FROM core_indicator_rollup")
+    for col in ("year", "decade"):
+        df[col] = df[col].astype("Int64")
+    return df
+
+
+def build_rollup(df, region_col="country"):
+    """
+    Compute the same rollup in pandas from the base frame; used when the dbt
+    model has not been built yet.
+    """
+    base = df.rename(columns={region_col: "country"})
+    base = base.assign(decade=base["year"] // 10 * 10)
+    metrics = [m for m in METRICS if m in base.columns]
+    for metric in metrics:
+        # Accumulate in float64 even for float32 columns; std is rebuilt from sumsq
+        base[metric] = base[metric].astype("float64")
+        base[f"_{metric}_sq"] = base[metric] ** 2
+
+    aggs = {}
+    for metric in metrics:
+        aggs.update({
+            f"{metric}_sum": (metric, "sum"),
+            f"{metric}_mean": (metric, "mean"),
+            f"{metric}_min": (metric, "min"),
+            f"{metric}_max": (metric, "max"),
+            f"{metric}_count": (metric, "count"),
+            f"{metric}_sumsq": (f"_{metric}_sq", "sum"),
+        })
+
+    frames = []
+    for dims, grain in GRAINS.items():
+        # The empty grouping set is one group over every row
+        part = base.groupby(list(dims) if dims else (lambda _: 0)).agg(**aggs).reset_index(drop=not dims)
+        part.insert(0, "grain", grain)
+        frames.append(part)
+    rollup = pd.concat(frames, ignore_index=True)
+    for col in DIMENSIONS:
+        if col not in rollup.columns:
+            rollup[col] = pd.NA
+    for col in ("year", "decade"):
+        rollup[col] = rollup[col].astype("Int64")
+    return rollup
+
+
+@st.cache_resource(ttl=QUERY_TTL, max_entries=1, show_spinner=False)
+def _rollup_snapshot(version):
+    try:
+        return load_rollup()
+    except MISSING_TABLE_ERRORS:
+        # Not built by dbt yet: compute it from the shared indicators frame
+        return build_rollup(get_indicators())
+
+
+def get_rollup():
+    """The rollup, shared read-only by every session and refreshed on new loads like get_indicators()."""
+    return _rollup_snapshot(data_version())
+
+
+def _cells(rollup, by, countries, year_range):
+    """
+    Pick the coarsest grouping set that can answer `by` under the filters:
+    a country filter needs the country dimension and a year range needs the
+    year dimension (decades are then re-derived from years).
+    """
+    all_countries = set(rollup.loc[rollup["grain"] == "country", "country"])
+    country_filter = countries is not None and set(countries) != all_countries
+    years = rollup.loc[rollup["grain"] == "year", "year"]
+    year_filter = year_range is not None and not years.empty and (
+        year_range[0] > years.min() or year_range[1] < years.max()
+    )
+
+    dims = set(by)
+    if country_filter:
+        dims.add("country")
+    if year_filter:
+        dims.add("year")
+        dims.discard("decade")
+    key = tuple(d for d in DIMENSIONS if d in dims)
+    cells = rollup[rollup["grain"] == GRAINS[key]]
+
+    if country_filter:
+        cells = cells[cells["country"].isin(list(countries))]
+    if year_filter:
+        cells = cells[cells["year"].between(year_range[0], year_range[1])]
+        if "decade" in by:
+            cells = cells.assign(decade=cells["year"] // 10 * 10)
+    return cells
+
+
+def summarize(rollup, metrics, by=(), countries=None, year_range=None):
+    """
+    Aggregate `metrics` grouped by `by` (any of country / year / decade) over
+    the selected countries and year range. Returns one row per group with
+    <metric>_<stat> columns for sum, mean, std, min, max and count.
+    """
+    by = list(by)
+    cells = _cells(rollup, by, countries, year_range)
+    if cells.empty:
+        return pd.DataFrame(columns=by)
+
+    # Means and standard deviations are rebuilt from sum / count / sumsq so
+    # they stay exact however the cells are recombined
+    spec = {}
+    for metric in metrics:
+        spec.update({
+            f"{metric}_sum": "sum", f"{metric}_count": "sum", f"{metric}_sumsq": "sum",
+            f"{metric}_min": "min", f"{metric}_max": "max",
+        })
+    if by:
+        out = cells.groupby(by)[list(spec)].agg(spec)
+    else:
+        out = cells[list(spec)].agg(spec).to_frame().T
+
+    for metric in metrics:
+        n = out[f"{metric}_count"].astype(float)
+        total = out[f"{metric}_sum"]
+        out[f"{metric}_mean"] = (total / n).where(n > 0)
+        # Sample variance, as pandas' std / describe report it
+        var = (out[f"{metric}_sumsq"] - total ** 2 / n) / (n - 1)
+        out[f"{metric}_std"] = np.sqrt(var.clip(lower=0)).where(n > 1)
+    return out.reset_index() if by else out.reset_index(drop=True)
+
+
+def describe(rollup, metrics, countries=None, year_range=None):
+    """count / mean / std / min / max table in the shape of DataFrame.describe()."""
+    row = summarize(rollup, metrics, countries=countries, year_range=year_range)
+    stats = ["count", "mean", "std", "min", "max"]
+    if row.empty:
+        return pd.DataFrame(index=stats, columns=metrics)
+    return pd.DataFrame(
+        {metric: [row[f"{metric}_{stat}"].iloc[0] for stat in stats] for metric in metrics},
+        index=stats,
+    )
+
+
+def pivot(rollup, metric, stat="mean", index="country", columns="year", countries=None, year_range=None):
+    """`stat` of `metric` laid out as an index x columns grid (e.g. country x year heatmaps)."""
+    table = summarize(rollup, [metric], by=[index, columns], countries=countries, year_range=year_range)
+    if table.empty:
+        return pd.DataFrame()
+    return table.pivot(index=index, columns=columns, values=f"{metric}_{stat}")
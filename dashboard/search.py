@@ -0,0 +1,81 @@
+# dashboard/search.py
+#
+# Column search for the Data Explorer, answered from an index built once per
+# column and data version instead of scanning the frame on every keystroke:
+#
+# - text columns: the distinct values, lowercased, plus the row positions
+#   grouped by value; a substring search only scans the distinct values
+# - numeric columns: the non-null values sorted, plus their row positions;
+#   equality and ranges are two binary searches
+
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import run_positions
+
+# kind:      "text" or "numeric"
+# values:    text - lowercased distinct values; numeric - sorted non-null values
+# positions: row positions grouped by distinct value (text) / in value order (numeric)
+# offsets:   text only - [offsets[i], offsets[i + 1]) are the positions of value i
+SearchIndex = namedtuple("SearchIndex", ["kind", "values", "positions", "offsets"])
+
+# "10..20", "..20", "10..", ">= 10", "<20", "=128.31" or a bare number
+_RANGE = re.compile(r"^\s*(?P<lo>[^.\s][^\s]*?)?\s*\.\.\s*(?P<hi>\S+)?\s*$")
+_COMPARISON = re.compile(r"^\s*(?P<op>>=|<=|>|<|=)?\s*(?P<value>\S+)\s*$")
+
+
+def build_index(series):
+    """SearchIndex of one column; text for strings and categories, numeric otherwise."""
+    if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.to_numpy()
+        present = np.flatnonzero(~pd.isna(values))
+        order = present[np.argsort(values[present], kind="stable")]
+        return SearchIndex("numeric", values[order], order, None)
+
+    codes, uniques = pd.factorize(series)
+    labels = np.array([str(value).lower() for value in uniques], dtype=str)
+    present = np.flatnonzero(codes >= 0)
+    order = present[np.argsort(codes[present], kind="stable")]
+    offsets = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return SearchIndex("text", labels, order, offsets)
+
+
+def parse_range(term):
+    """
+    (low, high, low_inclusive, high_inclusive) for a numeric search term,
+    None for an open end; raises ValueError if the term is not numeric.
+    """
+    match = _RANGE.match(term)
+    if match:
+        lo, hi = match.group("lo"), match.group("hi")
+        return (float(lo) if lo else None), (float(hi) if hi else None), True, True
+    match = _COMPARISON.match(term)
+    if not match:
+        raise ValueError(f"Not a number or range: {term!r}")
+    op, value = match.group("op") or "=", float(match.group("value"))
+    return {
+        "=": (value, value, True, True),
+        ">": (value, None, False, True),
+        ">=": (value, None, True, True),
+        "<": (None, value, True, False),
+        "<=": (None, value, True, True),
+    }[op]
+
+
+def search(index, term):
+    """Row positions (ascending) matching `term`: a substring for text, a number or range for numbers."""
+    if index.kind == "text":
+        matched = np.flatnonzero(np.char.find(index.values, term.lower()) >= 0)
+        positions = index.positions[run_positions(index.offsets[matched], index.offsets[matched + 1])]
+        return np.sort(positions)
+
+    lo, hi, lo_inclusive, hi_inclusive = parse_range(term)
+    values = index.values
+    # Compare at the column's precision, so "128.31" matches a float32 128.31
+    cast = values.dtype.type if values.dtype.kind == "f" else float
+    start = 0 if lo is None else np.searchsorted(values, cast(lo), side="left" if lo_inclusive else "right")
+    stop = len(values) if hi is None else np.searchsorted(values, cast(hi), side="right" if hi_inclusive else "left")
+    return np.sort(index.positions[start:max(start, stop)])
@@ -0,0 +1 @@
+"""EuroMetrics ingestion scripts (run with ``python -m data_ingestion.<script>``)."""
@@ -0,0 +1,37 @@
+# data_ingestion/__main__.py
+#
+#   python -m data_ingestion run [--force] [--workers N] [--only gdp hicp] [--skip-dbt]
+
+import argparse
+import os
+import sys
+
+from data_ingestion.pipeline import DEFAULT_WORKERS, STAGES, needs_database, run_pipeline, select_stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m data_ingestion", description="EuroMetrics ingestion pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="fetch → clean → load → dbt run, datasets in parallel")
+    run.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                     help="stages (and HICP downloads) run concurrently")
+    run.add_argument("--force", action="store_true",
+                     help="ignore caches and re-run every stage")
+    run.add_argument("--only", nargs="+", choices=["gdp", "hicp", "population"],
+                     help="restrict the run to these datasets")
+    run.add_argument("--skip-dbt", action="store_true", help="do not run dbt at the end")
+    run.add_argument("--database-url", default=os.environ.get("EUROMETRICS_DATABASE_URL"),
+                     help="SQLAlchemy URL for the loads (default: $EUROMETRICS_DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    stages = select_stages(STAGES, datasets=args.only, skip_dbt=args.skip_dbt)
+    if needs_database(stages) and not args.database_url:
+        # Fail now rather than at the first load, after all the downloads
+        run.error("no database to load into: pass --database-url or set EUROMETRICS_DATABASE_URL")
+    status = run_pipeline(stages, workers=args.workers, force=args.force, database_url=args.database_url)
+    return 1 if any(s in ("failed", "blocked") for s in status.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
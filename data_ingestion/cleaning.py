@@ -0,0 +1,120 @@
+# data_ingestion/cleaning.py
+#
+# Importable versions of the cleaning notebooks (notebooks/clean_eurostat_gdp,
+# 01_ecb_hicp_cleaning, clean_eurostat_population). Every function takes the
+# raw DataFrame the notebook loads and returns the cleaned table it saves,
+# without touching its input.
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pandas.api.types import is_numeric_dtype
+
+from data_ingestion.eurostat_tsv import split_cells
+
+
+def _geo_column(df):
+    # Eurostat wide dumps name the last key column "geo\TIME_PERIOD"
+    for col in df.columns:
+        if str(col).strip().startswith("geo"):
+            return col
+    raise ValueError(f"No geo column in {df.columns.tolist()}")
+
+
+def _filter_rows(df, filters):
+    """Keep rows whose columns match `filters` ({column: allowed values}) with one boolean mask."""
+    if not filters:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for col, allowed in filters.items():
+        mask &= df[col].isin(list(allowed)).to_numpy()
+    return df[mask]
+
+
+def _wide_values(df, columns):
+    """
+    Return the observation columns as one (rows, columns) float64 matrix.
+    Numeric columns are copied as is; text cells such as "1234.5 p" or ": "
+    are split with Arrow kernels, so no per-cell Python strings are built.
+    """
+    values = np.empty((len(df), len(columns)), dtype=np.float64)
+    for j, col in enumerate(columns):
+        s = df[col]
+        if is_numeric_dtype(s):
+            values[:, j] = s.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            value, _ = split_cells(pa.array(s, type=pa.string(), from_pandas=True))
+            values[:, j] = value.to_numpy(zero_copy_only=False)
+    return values
+
+
+def _stack(values):
+    """
+    (row, column) positions of the non-missing cells in column-major order,
+    i.e. the order `melt` produces, without materialising the missing ones.
+    """
+    cols, rows = np.nonzero(~np.isnan(values.T))
+    return rows, cols
+
+
+def clean_gdp(df_raw, filters=None):
+    """
+    Clean a wide Eurostat GDP table (geo\\TIME_PERIOD, "1975 ", "1976 ", ...)
+    into (geo, year, value) rows; `year` is a datetime, missing values are
+    dropped. Flags such as "p" (provisional) are stripped instead of turning
+    the value into NaN. `filters` ({column: values}) is applied first.
+    """
+    df = _filter_rows(df_raw, filters)
+    geo_col = _geo_column(df)
+    year_cols = [col for col in df.columns if str(col).strip().isdigit()]
+    values = _wide_values(df, year_cols)
+    rows, cols = _stack(values)
+
+    years = pd.to_datetime([str(col).strip() for col in year_cols], format="%Y").to_numpy()
+    return pd.DataFrame({
+        "geo": df[geo_col].to_numpy()[rows],
+        "year": years[cols],
+        "value": values[rows, cols],
+    })
+
+
+def clean_hicp(df_raw, region=None):
+    """
+    Clean a raw ECB HICP dump into (date, hicp_index, region). Only
+    TIME_PERIOD / OBS_VALUE (and REF_AREA when `region` is not given) are
+    read; rows without a date or index value are dropped.
+    """
+    df = pd.DataFrame({
+        # TIME_PERIOD is always "YYYY-MM": an explicit format skips per-row inference
+        "date": pd.to_datetime(df_raw["TIME_PERIOD"].astype(str), format="%Y-%m", errors="coerce"),
+        "hicp_index": pd.to_numeric(df_raw["OBS_VALUE"], errors="coerce"),
+        "region": region if region is not None else df_raw["REF_AREA"],
+    })
+    df.dropna(subset=["date", "hicp_index"], inplace=True)
+    df.reset_index(drop=True, inplace=True)
+    return df
+
+
+def clean_population(df_raw, regions=None, sex="T", age="TOTAL"):
+    """
+    Clean the wide demo_pjan dump (freq, unit, age, sex, geo\\TIME_PERIOD,
+    1960_value, 1960_flag, ...) into (region, year, population). The
+    sex / age / geo filters run on the wide table, before it is reshaped,
+    so only the handful of matching series are ever stacked.
+    """
+    geo_col = _geo_column(df_raw)
+    filters = {"sex": [sex], "age": [age]}
+    if regions is not None:
+        filters[geo_col] = regions
+    df = _filter_rows(df_raw, filters)
+
+    value_cols = [col for col in df.columns if str(col).endswith("_value")]
+    values = _wide_values(df, value_cols)
+    rows, cols = _stack(values)
+
+    years = np.array([int(str(col)[:-len("_value")]) for col in value_cols])
+    return pd.DataFrame({
+        "region": df[geo_col].to_numpy()[rows],
+        "year": years[cols],
+        "population": values[rows, cols].astype(np.int64),
+    })
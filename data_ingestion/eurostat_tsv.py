@@ -0,0 +1,159 @@
+# data_ingestion/eurostat_tsv.py
+
+import gzip
+import math
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+# Eurostat marks missing observations with ":" and appends flags to values
+# ("1234.5 p" = provisional, ": c" = confidential, ...)
+MISSING_MARKER = ":"
+
+
+def parse_header(line):
+    """
+    Split the composite TSV header, e.g.
+    ``freq,unit,age,sex,geo\\TIME_PERIOD<TAB>1960 <TAB>1961 ...``,
+    into the list of dimension names and the list of period labels.
+    """
+    key_part, *periods = line.rstrip("\r\n").split("\t")
+    dims = key_part.split("\\")[0].split(",")
+    return dims, [p.strip() for p in periods]
+
+
+def parse_cell(cell):
+    """Return (value, flag) for one TSV cell; ``:`` becomes NaN."""
+    cell = cell.strip()
+    if not cell:
+        return math.nan, ""
+    value, _, flag = cell.partition(" ")
+    if value == MISSING_MARKER:
+        return math.nan, flag.strip()
+    return float(value), flag.strip()
+
+
+def iter_filtered_rows(lines, filters=None):
+    """
+    Stream a Eurostat TSV body line by line, yielding
+    ``(dims, periods, cells)`` only for series whose dimension key matches
+    `filters` ({dimension: allowed values}). The key is checked before the
+    (much longer) value part of the line is split, so filtered-out series
+    cost almost nothing.
+    """
+    lines = iter(lines)
+    dims, periods = parse_header(next(lines))
+    checks = [(dims.index(dim), set(allowed)) for dim, allowed in (filters or {}).items()]
+
+    for line in lines:
+        key, sep, rest = line.partition("\t")
+        if not sep:
+            continue
+        key_values = key.split(",")
+        if any(key_values[i] not in allowed for i, allowed in checks):
+            continue
+        yield dict(zip(dims, key_values)), periods, rest.rstrip("\r\n").split("\t")
+
+
+def iter_records(lines, filters=None):
+    """
+    Yield one typed long-format record per observation:
+    ``{<dimension>: code, ..., "period": str, "value": float, "flag": str}``.
+    Missing values are NaN; flags are split off the value into "flag".
+    """
+    for dims, periods, cells in iter_filtered_rows(lines, filters):
+        for period, cell in zip(periods, cells):
+            value, flag = parse_cell(cell)
+            yield {**dims, "period": period, "value": value, "flag": flag}
+
+
+def split_cells(cells):
+    """
+    Vectorised parse_cell: split an Arrow string array of TSV cells into a
+    float64 value array (null for ":" and empty cells) and a flag array.
+    """
+    # "1234.5 p" / ": c" / "2024.0" -> value / flag. Appending a space first
+    # guarantees every cell splits into exactly two parts.
+    cells = pc.utf8_trim_whitespace(cells)
+    parts = pc.split_pattern(pc.binary_join_element_wise(cells, " ", ""), " ", max_splits=1)
+    value = pc.list_element(parts, 0)
+    missing = pc.or_(pc.equal(value, MISSING_MARKER), pc.equal(value, ""))
+    value = pc.cast(pc.if_else(missing, pa.scalar(None, pa.string()), value), pa.float64())
+    return value, pc.utf8_rtrim_whitespace(pc.list_element(parts, 1))
+
+
+def _long_batch(batch, dims, filters):
+    """
+    Vectorised reshape of one wide record batch into a long Arrow table
+    (dims..., period, value, flag). Everything runs in Arrow compute
+    kernels; no per-cell Python objects are created.
+    """
+    keys = pc.split_pattern(batch.column(0), ",")
+    key_arrays = [pc.list_element(keys, i) for i in range(len(dims))]
+
+    # Filter on the dimension key before touching the value columns
+    if filters:
+        mask = None
+        for dim, allowed in filters.items():
+            hit = pc.is_in(key_arrays[dims.index(dim)], value_set=pa.array(list(allowed), pa.string()))
+            mask = hit if mask is None else pc.and_(mask, hit)
+        batch = batch.filter(mask)
+        key_arrays = [arr.filter(mask) for arr in key_arrays]
+    n_series = batch.num_rows
+    if n_series == 0:
+        return None
+
+    periods = [name.strip() for name in batch.schema.names[1:]]
+    n_periods = len(periods)
+
+    columns = {
+        dim: pa.concat_arrays([arr.dictionary_encode()] * n_periods)
+        for dim, arr in zip(dims, key_arrays)
+    }
+    period_codes = np.repeat(np.arange(n_periods, dtype=np.int32), n_series)
+    columns["period"] = pa.DictionaryArray.from_arrays(pa.array(period_codes), pa.array(periods))
+
+    value, flag = split_cells(pa.concat_arrays(batch.columns[1:]))
+    columns["value"] = value
+    columns["flag"] = flag.dictionary_encode()
+    return pa.table(columns)
+
+
+def _read_header(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.readline().rstrip("\r\n").split("\t")
+
+
+def iter_tsv_chunks(path, filters=None, block_size=4 << 20):
+    """
+    Parse a Eurostat TSV file (gzip is detected from the extension) into
+    long-format DataFrames, one Arrow record batch of about `block_size`
+    bytes at a time, so memory stays bounded on very large extracts.
+    Each frame has one categorical column per dimension plus period
+    (categorical), value (float64, NaN for ":") and flag (categorical).
+    """
+    # Type every column as string so ":" cells never trip type inference
+    names = _read_header(path)
+    reader = pa_csv.open_csv(
+        pa.input_stream(path, compression="detect"),
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        parse_options=pa_csv.ParseOptions(delimiter="\t"),
+        convert_options=pa_csv.ConvertOptions(column_types={name: pa.string() for name in names}),
+    )
+    dims = names[0].split("\\")[0].split(",")
+    for batch in reader:
+        long = _long_batch(batch, dims, filters)
+        if long is not None:
+            yield long.to_pandas()
+
+
+def read_tsv(path, filters=None, block_size=4 << 20):
+    """Parse a whole Eurostat TSV file into one long-format DataFrame (see iter_tsv_chunks)."""
+    frames = list(iter_tsv_chunks(path, filters, block_size))
+    if not frames:
+        return pd.DataFrame(columns=["period", "value", "flag"])
+    return pd.concat(frames, ignore_index=True)
@@ -1,10 +1,30 @@
+import pandas as pd
 import requests
-import os
 
-def fetch_gdp_raw():
+from data_ingestion.eurostat_tsv import iter_tsv_chunks, read_tsv
+from data_ingestion.http_client import commit_cache_meta, download_if_changed, make_session
+from data_ingestion.parquet_store import write_dataset
+
+# Annual GDP at market prices (million EUR) for the tracked regions, as TSV
+GDP_TSV_URL = "https://ec.europa.eu/eurostat/api/dissemination/sdmx/2.1/data/NAMA_10_GDP/A.CP_MEUR.B1GQ.FR+DE+EA19?format=TSV"
+GDP_RAW_TSV_PATH = "data/eurostat_gdp_raw.tsv"
+GDP_CLEAN_PATH = "data/cleaned_eurostat_gdp.csv"
+# Wide copy of the TSV that notebooks/clean_eurostat_gdp.ipynb and
+# cleaning.clean_gdp read, and the long-format copy next to it
+GDP_RAW_CSV_PATH = "data/eurostat_gdp_raw.csv"
+GDP_LONG_CSV_PATH = "data/eurostat_gdp_long.csv"
+
+def download_gdp_tsv(force=False):
+    """Conditionally download the GDP TSV; returns False when Eurostat answers 304."""
+    with make_session(1) as session:
+        return download_if_changed(session, GDP_TSV_URL, GDP_RAW_TSV_PATH, force=force)
+
+def fetch_gdp_raw(force=False):
     """
     Fetch raw GDP data (annual, market prices in million EUR) for FR, DE, EA19
     from Eurostat's SDMX API and save it as TSV (then optionally convert).
+    Returns True if new data was saved, False if the cached copy is still
+    current (304), None if every format failed.
     """
     # Build the URL properly - try TSV format first as it's preferred by Eurostat
     base_url = "https://ec.europa.eu/eurostat/api/dissemination/sdmx/2.1/data"
@@ -25,64 +45,102 @@ def fetch_gdp_raw():
         print(f"URL: {url}")
         
         try:
-            resp = requests.get(url)
-            resp.raise_for_status()
+            with make_session(1) as session:
+                changed = download_if_changed(session, url, output_path, force=force)
             
-            os.makedirs("data", exist_ok=True)
-            with open(output_path, "wb") as f:
-                f.write(resp.content)
-            
-            print(f"✅ Successfully saved {format_param} data to {output_path}")
-            return  # Exit on first success
+            if changed:
+                print(f"✅ Successfully saved {format_param} data to {output_path}")
+                if format_param == "TSV":
+                    clean_gdp_tsv(output_path)
+                commit_cache_meta(output_path)
+            else:
+                print(f"✅ {output_path} is up to date (304 Not Modified)")
+            return changed  # Exit on first success
             
         except requests.exceptions.HTTPError as e:
             print(f"❌ Failed with {format_param} format: {e}")
             continue
     
     print("❌ All formats failed. Check the API documentation or dataset availability.")
+    return None
 
-def fetch_gdp_raw_simple():
+def fetch_gdp_raw_simple(force=False):
     """
-    Alternative: Try the most basic TSV format that Eurostat prefers
+    Alternative: Try the most basic TSV format that Eurostat prefers.
+    Skips the download and the CSV conversion when Eurostat answers 304.
     """
-    url = "https://ec.europa.eu/eurostat/api/dissemination/sdmx/2.1/data/NAMA_10_GDP/A.CP_MEUR.B1GQ.FR+DE+EA19?format=TSV"
-    
-    print(f"Fetching GDP data with TSV format:\n{url}")
+    print(f"Fetching GDP data with TSV format:\n{GDP_TSV_URL}")
     
+    raw_path = GDP_RAW_TSV_PATH
     try:
-        resp = requests.get(url)
-        resp.raise_for_status()
+        changed = download_gdp_tsv(force=force)
         
-        os.makedirs("data", exist_ok=True)
-        raw_path = "data/eurostat_gdp_raw.tsv"
-        with open(raw_path, "wb") as f:
-            f.write(resp.content)
+        if not changed:
+            print(f"✅ {raw_path} is up to date (304 Not Modified) – skipping conversion")
+            return False
         
         print(f"✅ Saved TSV data to {raw_path}")
         
-        # Optionally convert TSV to CSV
-        convert_tsv_to_csv(raw_path, "data/eurostat_gdp_raw.csv")
+        # Wide and long-format copies of the raw data, then the cleaned table
+        convert_tsv_to_csv(raw_path, GDP_RAW_CSV_PATH)
+        convert_tsv_to_long_csv(raw_path, GDP_LONG_CSV_PATH)
+        clean_gdp_tsv(raw_path)
+        commit_cache_meta(raw_path)
+        return True
         
     except requests.exceptions.HTTPError as e:
         print(f"❌ Request failed: {e}")
         print("The dataset might not be available or the API structure has changed.")
 
 def convert_tsv_to_csv(tsv_path, csv_path):
-    """Convert TSV file to CSV format"""
+    """Convert TSV file to CSV format (same wide layout, tabs become commas)"""
     try:
-        with open(tsv_path, 'r', encoding='utf-8') as tsv_file:
-            content = tsv_file.read()
-        
-        # Replace tabs with commas
-        csv_content = content.replace('\t', ',')
-        
-        with open(csv_path, 'w', encoding='utf-8') as csv_file:
-            csv_file.write(csv_content)
+        with open(tsv_path, 'r', encoding='utf-8') as tsv_file, \
+                open(csv_path, 'w', encoding='utf-8') as csv_file:
+            for line in tsv_file:
+                csv_file.write(line.replace('\t', ','))
         
         print(f"✅ Converted TSV to CSV: {csv_path}")
     except Exception as e:
         print(f"❌ TSV to CSV conversion failed: {e}")
 
+def convert_tsv_to_long_csv(tsv_path, csv_path):
+    """
+    Convert a Eurostat TSV into a long-format CSV
+    (freq, unit, na_item, geo, period, value, flag): the composite key is
+    split into columns, ":" becomes an empty value and flags get their own
+    column.
+    """
+    try:
+        rows = 0
+        with open(csv_path, 'w', encoding='utf-8', newline='') as csv_file:
+            for i, chunk in enumerate(iter_tsv_chunks(tsv_path)):
+                chunk.to_csv(csv_file, header=(i == 0), index=False)
+                rows += len(chunk)
+        
+        print(f"✅ Converted TSV to long-format CSV: {csv_path} ({rows} rows)")
+    except Exception as e:
+        print(f"❌ TSV to CSV conversion failed: {e}")
+
+def clean_gdp_tsv(tsv_path, csv_path=GDP_CLEAN_PATH):
+    """
+    Build the cleaned GDP table (geo, year, value) straight from the raw TSV,
+    replacing the notebook's melt / str.replace / dropna steps, and write it
+    to CSV and to the Parquet landing zone.
+    """
+    df = read_tsv(tsv_path)
+    df = df.dropna(subset=["value"])
+    df = pd.DataFrame({
+        "geo": df["geo"],
+        "year": pd.to_datetime(df["period"], format="%Y"),
+        "value": df["value"],
+    }).sort_values(["geo", "year"], ignore_index=True)
+    
+    df.to_csv(csv_path, index=False)
+    write_dataset(df, "gdp", "cleaned")
+    print(f"✅ Cleaned GDP data saved to {csv_path} ({len(df)} rows)")
+    return df
+
 if __name__ == "__main__":
     # Try the comprehensive approach first
     fetch_gdp_raw()
@@ -1,8 +1,26 @@
 # data_ingestion/fetch_raw_population.py
 
+import argparse
+import csv
+import gzip
+import io
+import math
+import os
+
 import pandas as pd
 from eurostat import get_data_df
 
+from data_ingestion.cleaning import clean_population
+from data_ingestion.eurostat_tsv import iter_filtered_rows, parse_cell
+from data_ingestion.http_client import DEFAULT_TIMEOUT, make_session
+from data_ingestion.parquet_store import write_dataset
+
+# Full demo_pjan dump as gzipped TSV from the dissemination API
+DEMO_PJAN_URL = "https://ec.europa.eu/eurostat/api/dissemination/sdmx/2.1/data/DEMO_PJAN?format=TSV&compressed=true"
+
+# Regions tracked by the dashboard (Eurostat geo codes)
+POPULATION_REGIONS = ["FR", "DE", "EA19"]
+
 def fetch_raw_population():
     """
     Fetch the full 'demo_pjan' population dataset from Eurostat
@@ -11,16 +29,77 @@ def fetch_raw_population():
     print("📡 Fetching raw demo_pjan population data via eurostat package...")
     # Grab the complete dataset (including all flags, age groups, sexes, regions, years)
     df = get_data_df('demo_pjan', flags=True)
-    
+
     # Save raw dump for later cleaning
     output_path = "data/raw_demo_pjan_population.csv"
     df.to_csv(output_path)
     print(f"✅ Raw data saved to {output_path}")
-    
+
     return df
 
-if __name__ == "__main__":
-    fetch_raw_population()
+def iter_population(lines, regions=POPULATION_REGIONS, sex="T", age="TOTAL"):
+    """
+    Yield long-format (region, year, population) rows from demo_pjan TSV
+    lines, keeping only the requested geos / sex / age while reading.
+    Missing (":") observations are dropped and flags are ignored.
+    """
+    filters = {"geo": regions, "sex": [sex], "age": [age]}
+    for dims, periods, cells in iter_filtered_rows(lines, filters):
+        for period, cell in zip(periods, cells):
+            value, _ = parse_cell(cell)
+            if not math.isnan(value):
+                yield dims["geo"], int(period), int(value)
 
-   
+def write_population(lines, regions=POPULATION_REGIONS, sex="T", age="TOTAL", output_path="data/cleaned_population.csv"):
+    """
+    Filter demo_pjan TSV `lines` into the cleaned (region, year, population)
+    CSV at `output_path`, plus its Parquet copy. Returns the number of rows written.
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    rows = 0
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["region", "year", "population"])
+        for row in iter_population(lines, regions, sex, age):
+            writer.writerow(row)
+            rows += 1
+
+    print(f"✅ {rows} population rows for {', '.join(regions)} saved to {output_path}")
+
+    # The cleaned output is tiny, so the Parquet copy is written from the CSV
+    write_dataset(pd.read_csv(output_path), "population", "cleaned")
+    return rows
 
+def stream_population(regions=POPULATION_REGIONS, sex="T", age="TOTAL", output_path="data/cleaned_population.csv",
+                      url=DEMO_PJAN_URL):
+    """
+    Stream the demo_pjan dump from Eurostat, decompressing and filtering it
+    on the fly, and write only the cleaned (region, year, population) rows.
+    Neither the raw dump nor the wide table is ever held in memory or on disk.
+    Returns the number of rows written.
+    """
+    print(f"📡 Streaming demo_pjan from {url}")
+    with make_session(1) as session, session.get(url, stream=True, timeout=DEFAULT_TIMEOUT) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True  # undo any transport-level Content-Encoding
+        body = resp.raw
+        if url.endswith("compressed=true") or resp.headers.get("Content-Type", "").endswith("gzip"):
+            body = gzip.GzipFile(fileobj=body)
+        lines = io.TextIOWrapper(body, encoding="utf-8")
+        return write_population(lines, regions, sex, age, output_path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch Eurostat demo_pjan population data.")
+    parser.add_argument("--regions", nargs="+", default=POPULATION_REGIONS,
+                        help="Eurostat geo codes to keep")
+    parser.add_argument("--raw-dump", action="store_true",
+                        help="save the full raw dump via the eurostat package instead of streaming")
+    args = parser.parse_args()
+    if args.raw_dump:
+        cleaned = clean_population(fetch_raw_population(), regions=args.regions)
+        cleaned.to_csv("data/cleaned_population.csv", index=False)
+        write_dataset(cleaned, "population", "cleaned")
+        print(f"✅ {len(cleaned)} population rows saved to data/cleaned_population.csv")
+    else:
+        stream_population(regions=args.regions)
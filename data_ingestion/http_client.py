@@ -0,0 +1,123 @@
+# data_ingestion/http_client.py
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Resilience defaults shared by the ECB and Eurostat fetchers
+DEFAULT_POOL_SIZE = 4
+DEFAULT_TIMEOUT = (5, 60)      # (connect, read) seconds
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 1.0          # seconds, doubled after every failed attempt
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def make_session(pool_size=DEFAULT_POOL_SIZE):
+    """
+    Build one keep-alive session that can be shared by worker threads, with a
+    connection pool large enough that no worker waits for a socket.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_with_retry(session, url, headers=None, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                   backoff=DEFAULT_BACKOFF):
+    """
+    GET `url` with a per-request timeout, retrying connection errors,
+    timeouts and 429/5xx responses with exponential backoff.
+    A 304 Not Modified is returned to the caller like any other success.
+    """
+    for attempt in range(retries + 1):
+        try:
+            resp = session.get(url, headers=headers, timeout=timeout)
+            if resp.status_code not in RETRY_STATUS_CODES:
+                resp.raise_for_status()
+                return resp
+            error = requests.exceptions.HTTPError(f"{resp.status_code} from {url}", response=resp)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+
+        if attempt == retries:
+            raise error
+        delay = backoff * (2 ** attempt)
+        print(f"⚠️  {error} – retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+        time.sleep(delay)
+
+
+def _meta_path(path):
+    return f"{path}.meta.json"
+
+
+def _pending_meta_path(path):
+    return f"{path}.pending.meta.json"
+
+
+def load_cache_meta(path):
+    """Return the ETag/Last-Modified metadata stored next to `path`, or {}."""
+    try:
+        with open(_meta_path(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def download_if_changed(session, url, path, force=False, **kwargs):
+    """
+    Conditional GET of `url` into `path`.
+
+    The response's ETag / Last-Modified headers are kept pending in
+    `<path>.pending.meta.json` until the caller has loaded the body and
+    calls commit_cache_meta(path); from then on they are sent back as
+    If-None-Match / If-Modified-Since. While a download is still pending no
+    validators are sent, so a body whose load failed is fetched and reported
+    again. Returns True when a new body was written and False when the
+    server answered 304 Not Modified, in which case `path` is left untouched.
+    """
+    meta = load_cache_meta(path)
+    headers = {}
+    pending = os.path.exists(_pending_meta_path(path))
+    if not force and not pending and os.path.exists(path) and meta.get("url") == url:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    resp = get_with_retry(session, url, headers=headers, **kwargs)
+    if resp.status_code == 304:
+        return False
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Write to a temp file first so a crash never leaves a half-written raw file
+    tmp_path = f"{path}.part"
+    with open(tmp_path, "wb") as f:
+        f.write(resp.content)
+    os.replace(tmp_path, path)
+
+    with open(_pending_meta_path(path), "w", encoding="utf-8") as f:
+        json.dump({
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }, f, indent=2)
+    return True
+
+
+def commit_cache_meta(path):
+    """
+    Promote the validators of the last download of `path` once its data has
+    been loaded, so the next download_if_changed can be answered with a 304.
+    Does nothing when no download is pending.
+    """
+    try:
+        os.replace(_pending_meta_path(path), _meta_path(path))
+    except FileNotFoundError:
+        pass
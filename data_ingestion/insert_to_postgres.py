@@ -1,6 +1,8 @@
 import pandas as pd
 from sqlalchemy import create_engine
 
+from data_ingestion.fetch_ecb_hicp import upsert_hicp
+
 # Load cleaned data
 df = pd.read_csv("C:/Users/lenovo/eurometrics/data/cleaned_ecb_hicp.csv")
 
@@ -17,7 +19,8 @@ engine = create_engine(
     f"postgresql+psycopg2://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
 )
 
-# Insert data into the hicp_inflation table
-df.to_sql("hicp_inflation", engine, if_exists="append", index=False)
+# Insert new rows into the hicp_inflation table and update revised ones;
+# a plain append would fail on its unique (region, date) key
+upsert_hicp(df[["date", "hicp_index", "region"]], engine)
 
 print("✅ Data inserted into PostgreSQL successfully.")
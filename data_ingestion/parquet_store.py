@@ -0,0 +1,164 @@
+# data_ingestion/parquet_store.py
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# data/parquet/<layer>/<dataset>/<partition>=<value>/part-0.parquet
+PARQUET_ROOT = os.path.join("data", "parquet")
+LAYERS = ("raw", "cleaned")
+
+DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+
+# Typed schemas of the cleaned datasets (the partition column is included
+# here; on disk it lives in the directory name)
+CLEANED_SCHEMAS = {
+    "hicp": pa.schema([
+        ("date", pa.date32()),
+        ("hicp_index", pa.float64()),
+        ("region", DICT_STRING),
+    ]),
+    "gdp": pa.schema([
+        ("geo", DICT_STRING),
+        ("year", pa.date32()),
+        ("value", pa.float64()),
+    ]),
+    "population": pa.schema([
+        ("region", DICT_STRING),
+        ("year", pa.int16()),
+        ("population", pa.int64()),
+    ]),
+}
+
+# Column each dataset is partitioned on
+PARTITION_COLUMNS = {
+    "ecb_hicp": "region",
+    "hicp": "region",
+    "gdp": "geo",
+    "population": "region",
+}
+
+# Existing CSVs that `python -m data_ingestion.parquet_store` backfills
+CLEANED_CSVS = {
+    "hicp": os.path.join("data", "cleaned_ecb_hicp_all.csv"),
+    "gdp": os.path.join("data", "cleaned_eurostat_gdp.csv"),
+    "population": os.path.join("data", "cleaned_population.csv"),
+}
+
+
+def dataset_path(dataset, layer):
+    if layer not in LAYERS:
+        raise ValueError(f"Unknown layer {layer!r}; expected one of {LAYERS}")
+    return os.path.join(PARQUET_ROOT, layer, dataset)
+
+
+def _raw_ecb_table(df):
+    """
+    Type a raw ECB dump (read with dtype=str so codes like ICP_ITEM "000000"
+    survive): TIME_PERIOD as date32, OBS_VALUE as float64, every other column
+    dictionary-encoded.
+    """
+    df = df.copy()
+    df["TIME_PERIOD"] = pd.to_datetime(df["TIME_PERIOD"].astype(str) + "-01", format="%Y-%m-%d", errors="coerce").dt.date
+    df["OBS_VALUE"] = pd.to_numeric(df["OBS_VALUE"], errors="coerce")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fields = []
+    for field in table.schema:
+        if field.name == "TIME_PERIOD":
+            fields.append(pa.field(field.name, pa.date32()))
+        elif field.name == "OBS_VALUE":
+            fields.append(pa.field(field.name, pa.float64()))
+        else:
+            # Mostly constant per series, so they dictionary-encode to almost nothing
+            fields.append(pa.field(field.name, DICT_STRING))
+    return table.cast(pa.schema(fields))
+
+
+def to_arrow(df, dataset, layer):
+    """Convert a DataFrame to an Arrow table using the dataset's typed schema."""
+    if layer == "raw" and dataset == "ecb_hicp":
+        return _raw_ecb_table(df)
+    schema = CLEANED_SCHEMAS[dataset]
+    df = df[schema.names].copy()
+    for field in schema:
+        if pa.types.is_date32(field.type):
+            df[field.name] = pd.to_datetime(df[field.name]).dt.date
+        elif pa.types.is_dictionary(field.type):
+            df[field.name] = df[field.name].astype(str)
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def write_dataset(df, dataset, layer="cleaned"):
+    """
+    Write `df` under data/parquet/<layer>/<dataset>/, hive-partitioned by
+    region. Only the partitions present in `df` are replaced, so a
+    single-region refresh leaves the other regions untouched.
+    """
+    table = to_arrow(df, dataset, layer)
+    partition_col = PARTITION_COLUMNS[dataset]
+    ds.write_dataset(
+        table,
+        dataset_path(dataset, layer),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([table.schema.field(partition_col)]), flavor="hive"),
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+        # One directory per region; Arrow's default limit (1024) fails on larger extracts
+        max_partitions=max(1024, len(table.column(partition_col).unique())),
+    )
+    return table.num_rows
+
+
+def has_dataset(dataset, layer="cleaned"):
+    return os.path.isdir(dataset_path(dataset, layer))
+
+
+def read_dataset(dataset, layer="cleaned", columns=None, regions=None):
+    """
+    Read a dataset back as a DataFrame, memory-mapping the files and
+    decoding only `columns`. `regions` prunes whole partitions before any
+    file is opened.
+    """
+    partition_col = PARTITION_COLUMNS[dataset]
+    filters = [(partition_col, "in", list(regions))] if regions else None
+    table = pq.read_table(
+        dataset_path(dataset, layer),
+        columns=columns,
+        filters=filters,
+        memory_map=True,
+        partitioning="hive",
+    )
+    return table.to_pandas(date_as_object=False)
+
+
+def read_cleaned(dataset, columns=None, regions=None):
+    """Read a cleaned dataset from Parquet, falling back to its CSV if the Parquet copy does not exist yet."""
+    if has_dataset(dataset, "cleaned"):
+        return read_dataset(dataset, "cleaned", columns=columns, regions=regions)
+    df = pd.read_csv(CLEANED_CSVS[dataset], usecols=columns)
+    if regions:
+        df = df[df[PARTITION_COLUMNS[dataset]].isin(regions)]
+    return df
+
+
+def convert_existing():
+    """Backfill the Parquet zone from the CSVs already in data/."""
+    for dataset, csv_path in CLEANED_CSVS.items():
+        if os.path.exists(csv_path):
+            rows = write_dataset(pd.read_csv(csv_path), dataset, "cleaned")
+            print(f"✅ {csv_path} → {dataset_path(dataset, 'cleaned')} ({rows} rows)")
+
+    for name in sorted(os.listdir("data")):
+        if name.startswith("ecb_hicp_") and name.endswith(".csv"):
+            code = name[len("ecb_hicp_"):-len(".csv")]
+            raw = pd.read_csv(os.path.join("data", name), dtype=str)
+            raw["region"] = code
+            rows = write_dataset(raw, "ecb_hicp", "raw")
+            print(f"✅ data/{name} → {dataset_path('ecb_hicp', 'raw')} ({rows} rows)")
+
+
+if __name__ == "__main__":
+    convert_existing()
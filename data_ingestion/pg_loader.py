@@ -0,0 +1,331 @@
+# data_ingestion/pg_loader.py
+
+import io
+import re
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# Rows serialised into the in-memory buffer per COPY round-trip. Keeps
+# memory flat for wide or very long frames.
+COPY_CHUNK_ROWS = 100_000
+
+LOAD_MODES = ("append", "replace", "upsert", "swap")
+
+# Every loaded table carries the time each row last changed; dbt's
+# incremental models use it to find what needs reprocessing (see _start_load)
+LOADED_AT = "loaded_at"
+
+# One row per table with the time of its last load; the dashboard polls
+# max(loaded_at) here to notice new data without re-reading the tables
+INGESTION_LOG = "ingestion_log"
+
+# How long the swap transaction may wait for readers to release the live
+# table, and how often it retries before giving up
+SWAP_LOCK_TIMEOUT = "2s"
+SWAP_RETRIES = 5
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_list(columns):
+    return ", ".join(_quote(c) for c in columns)
+
+
+def copy_dataframe(cursor, df, table, chunk_rows=COPY_CHUNK_ROWS):
+    """
+    Stream `df` into `table` with COPY FROM STDIN, `chunk_rows` rows at a
+    time through a reusable in-memory CSV buffer. `cursor` is a raw
+    psycopg2 cursor, so the copy joins whatever transaction it belongs to.
+    """
+    sql = f"COPY {table} ({_column_list(df.columns)}) FROM STDIN WITH (FORMAT csv, NULL '')"
+    buf = io.StringIO()
+    for start in range(0, len(df), chunk_rows):
+        buf.seek(0)
+        buf.truncate()
+        df.iloc[start:start + chunk_rows].to_csv(buf, header=False, index=False, date_format="%Y-%m-%d %H:%M:%S")
+        buf.seek(0)
+        cursor.copy_expert(sql, buf)
+    return len(df)
+
+
+def _table_exists(conn, table):
+    return conn.execute(text("SELECT to_regclass(:t)"), {"t": _quote(table)}).scalar() is not None
+
+
+def _has_column(conn, table, column):
+    return conn.execute(text(
+        "SELECT 1 FROM pg_attribute WHERE attrelid = to_regclass(:t) AND attname = :c AND NOT attisdropped"
+    ), {"t": _quote(table), "c": column}).first() is not None
+
+
+def _ensure_table(engine, df, table):
+    """
+    Create `table` from the frame's dtypes if missing and make sure it has
+    the loaded_at column, in a transaction of its own. The ALTER takes an
+    exclusive lock on the table, so it only runs when the column is missing
+    and never inside a load.
+    """
+    with engine.begin() as conn:
+        if not _table_exists(conn, table):
+            df.head(0).to_sql(table, conn, index=False)
+        if not _has_column(conn, table, LOADED_AT):
+            conn.execute(text(
+                f"ALTER TABLE {_quote(table)} ADD COLUMN {LOADED_AT} timestamptz NOT NULL DEFAULT now()"
+            ))
+
+
+def record_load(conn, table, rows):
+    """Stamp `table` in the ingestion log, in the transaction that loaded it."""
+    if not _table_exists(conn, INGESTION_LOG):
+        # Parallel loaders may all find it missing; only one may create it
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:t))"), {"t": INGESTION_LOG})
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {INGESTION_LOG} ("
+            "table_name text PRIMARY KEY, loaded_at timestamptz NOT NULL, row_count bigint)"
+        ))
+    conn.execute(text(
+        f"INSERT INTO {INGESTION_LOG} (table_name, loaded_at, row_count) VALUES (:t, now(), :n) "
+        "ON CONFLICT (table_name) DO UPDATE SET loaded_at = EXCLUDED.loaded_at, row_count = EXCLUDED.row_count"
+    ), {"t": table, "n": rows})
+
+
+def _start_load(conn, table):
+    """
+    Wait for any other load of `table` to commit, then return the loaded_at
+    stamp for this one. Taking the stamp only once the lock is held makes a
+    table's stamps grow in commit order, so max(loaded_at) over the rows a
+    reader can see is a watermark no later commit can fall below.
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:t))"), {"t": table})
+    return conn.execute(text("SELECT clock_timestamp()")).scalar()
+
+
+def _stamped_select(columns, stage, previous):
+    """
+    SELECT the staged rows plus a loaded_at that is carried over from
+    identical rows in `previous`, so a full reload only stamps the rows that
+    are new or changed (with the :loaded_at parameter).
+    """
+    cols = _column_list(columns)
+    staged = ", ".join(f"s.{_quote(c)}" for c in columns)
+    previous_cols = ", ".join(f"p.{_quote(c)}" for c in columns)
+    # Rows are matched on their text form: unlike "=" it treats NULLs as equal,
+    # so rows with missing values keep their stamp, and unlike IS NOT DISTINCT
+    # FROM it can still be hash-joined
+    same = f"ROW({staged})::text = ROW({previous_cols})::text"
+    return (
+        f"SELECT {staged}, COALESCE(p.{LOADED_AT}, :loaded_at) FROM {stage} s "
+        f"LEFT JOIN (SELECT {cols}, max({LOADED_AT}) AS {LOADED_AT} FROM {previous} GROUP BY {cols}) p ON {same}"
+    )
+
+
+def _dependent_views(conn, table):
+    """(name, kind, definition) of the views that select directly from `table`."""
+    return conn.execute(text("""
+        SELECT DISTINCT format('%I.%I', n.nspname, v.relname), v.relkind, pg_get_viewdef(v.oid)
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        JOIN pg_class v ON v.oid = r.ev_class
+        JOIN pg_namespace n ON n.oid = v.relnamespace
+        WHERE d.refobjid = to_regclass(:t) AND v.oid <> d.refobjid
+    """), {"t": _quote(table)}).fetchall()
+
+
+def _index_definitions(conn, table):
+    """
+    (name, CREATE INDEX statement, constraint definition) for every index on
+    `table`. The constraint definition is set for the indexes behind a
+    PRIMARY KEY, UNIQUE or EXCLUDE constraint, None for plain indexes.
+    """
+    return conn.execute(text("""
+        SELECT i.relname, pg_get_indexdef(i.oid), pg_get_constraintdef(c.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        LEFT JOIN pg_constraint c ON c.conindid = x.indexrelid AND c.conrelid = x.indrelid
+        WHERE x.indrelid = to_regclass(:t)
+    """), {"t": _quote(table)}).fetchall()
+
+
+def _copy_privileges(conn, table, copy):
+    """Give `copy` (a quoted name) the owner and table-level grants of `table`."""
+    owner = conn.execute(text(
+        "SELECT pg_get_userbyid(relowner) FROM pg_class WHERE oid = to_regclass(:t)"
+    ), {"t": _quote(table)}).scalar()
+    conn.execute(text(f"ALTER TABLE {copy} OWNER TO {_quote(owner)}"))
+    grants = conn.execute(text("""
+        SELECT a.privilege_type, CASE WHEN a.grantee = 0 THEN NULL ELSE pg_get_userbyid(a.grantee) END, a.is_grantable
+        FROM pg_class c, aclexplode(c.relacl) a
+        WHERE c.oid = to_regclass(:t)
+    """), {"t": _quote(table)}).fetchall()
+    for privilege, grantee, grantable in grants:
+        conn.execute(text(
+            f"GRANT {privilege} ON {copy} TO {'PUBLIC' if grantee is None else _quote(grantee)}"
+            + (" WITH GRANT OPTION" if grantable else "")
+        ))
+
+
+_INDEX_TARGET = re.compile(r"^(CREATE (?:UNIQUE )?INDEX )(\S+)( ON (?:ONLY )?)(\S+)")
+
+
+def swap_dataframe(df, table, engine, chunk_rows=COPY_CHUNK_ROWS):
+    """
+    Reload `table` without readers ever waiting on the load or seeing it
+    half done. The rows are staged with COPY and written to a shadow
+    ``<table>__new`` (unchanged rows keep their loaded_at), which gets the
+    live table's constraints, owner and grants, and its indexes are built
+    there, outside any lock on the live table. One short
+    transaction then renames the shadow over the live table, re-points the
+    views that select from it and drops the old copy. The swap waits at most
+    SWAP_LOCK_TIMEOUT for running queries and retries SWAP_RETRIES times.
+    """
+    target, shadow, old = _quote(table), _quote(f"{table}__new"), _quote(f"{table}__old")
+    stage = _quote(f"_stage_{table}")
+
+    columns = list(df.columns)
+
+    _ensure_table(engine, df, table)
+
+    # 1. Build and index the shadow table (readers keep using the live one)
+    with engine.begin() as conn:
+        stamp = _start_load(conn, table)
+        views = _dependent_views(conn, table)
+        materialized = [name for name, kind, _ in views if kind != "v"]
+        if materialized:
+            raise ValueError(f"swap cannot re-point materialized views on {table}: {materialized}")
+        indexes = _index_definitions(conn, table)
+
+        conn.execute(text(f"DROP TABLE IF EXISTS {shadow}"))
+        # Everything but the indexes, which are cheaper to build once the rows are in
+        conn.execute(text(f"CREATE TABLE {shadow} (LIKE {target} INCLUDING ALL EXCLUDING INDEXES)"))
+        _copy_privileges(conn, table, shadow)
+        conn.execute(text(
+            f"CREATE TEMP TABLE {stage} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP"
+        ))
+        cursor = conn.connection.cursor()
+        try:
+            copy_dataframe(cursor, df, stage, chunk_rows)
+        finally:
+            cursor.close()
+        conn.execute(text(
+            f"INSERT INTO {shadow} ({_column_list(columns + [LOADED_AT])}) "
+            + _stamped_select(columns, stage, target)
+        ), {"loaded_at": stamp})
+        for name, definition, constraint in indexes:
+            # Built under a temporary name; renamed (with its constraint) once the old index is gone
+            if constraint:
+                conn.execute(text(f"ALTER TABLE {shadow} ADD CONSTRAINT {_quote(name + '__new')} {constraint}"))
+            else:
+                conn.execute(text(_INDEX_TARGET.sub(
+                    lambda m: f"{m.group(1)}{_quote(name + '__new')}{m.group(3)}{shadow}", definition
+                )))
+        conn.execute(text(f"ANALYZE {shadow}"))
+
+    # 2. Swap it in: renames plus view re-pointing, all catalog-only work
+    for attempt in range(1, SWAP_RETRIES + 1):
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+                # Readers lock a view before the table under it; take the locks in
+                # the same order so a reader mid-query cannot deadlock the swap
+                for name, _, _ in views:
+                    conn.execute(text(f"LOCK TABLE {name} IN ACCESS EXCLUSIVE MODE"))
+                conn.execute(text(f"ALTER TABLE {target} RENAME TO {old}"))
+                conn.execute(text(f"ALTER TABLE {shadow} RENAME TO {target}"))
+                for name, _, definition in views:
+                    # The saved definition names the table, so it now resolves to the new copy
+                    conn.execute(text(f"CREATE OR REPLACE VIEW {name} AS {definition}"))
+                conn.execute(text(f"DROP TABLE {old}"))
+                for name, _, _ in indexes:
+                    conn.execute(text(f"ALTER INDEX {_quote(name + '__new')} RENAME TO {_quote(name)}"))
+                record_load(conn, table, len(df))
+            break
+        except OperationalError as e:
+            if not ("lock timeout" in str(e) or "deadlock" in str(e)) or attempt == SWAP_RETRIES:
+                raise
+            print(f"⚠️ {table} is busy, retrying the swap ({attempt}/{SWAP_RETRIES})")
+            time.sleep(attempt)
+
+    return len(df)
+
+
+def load_dataframe(df, table, engine, mode="append", key=None, chunk_rows=COPY_CHUNK_ROWS):
+    """
+    Bulk-load `df` into `table` in a single transaction.
+
+    The frame is COPY'd into a temp staging table shaped like the target and
+    then moved across with one INSERT ... SELECT:
+
+    - ``append``  – add the staged rows.
+    - ``replace`` – DELETE the current rows and insert the staged ones. Unlike
+      to_sql(if_exists="replace") the table, its indexes and the views built
+      on it survive, and readers keep seeing the old rows until commit.
+    - ``upsert``  – insert new rows and update changed ones on the unique
+      `key` columns (a unique index on `key` must exist).
+    - ``swap``    – build a shadow copy and rename it over the table (see
+      swap_dataframe); for full reloads of tables the dashboard reads.
+
+    A missing target table is created from the frame's dtypes. Loads of one
+    table run one at a time; new and changed rows get the load's stamp
+    (see _start_load) and unchanged rows keep theirs. The load is recorded
+    in ingestion_log in the same transaction; an upsert that inserts or
+    changes nothing is not recorded, so readers keyed on the log keep their
+    caches.
+    Returns the number of rows written: every staged row, except in upsert
+    mode where rows identical to the stored ones are not counted.
+    """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode {mode!r}; expected one of {LOAD_MODES}")
+    if mode == "upsert" and not key:
+        raise ValueError("upsert mode needs the unique key columns")
+    if mode == "swap":
+        return swap_dataframe(df, table, engine, chunk_rows)
+
+    columns = list(df.columns)
+    cols = _column_list(columns)
+    target, stage = _quote(table), _quote(f"_stage_{table}")
+
+    _ensure_table(engine, df, table)
+
+    with engine.begin() as conn:
+        stamp = _start_load(conn, table)
+        conn.execute(text(
+            f"CREATE TEMP TABLE {stage} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP"
+        ))
+        cursor = conn.connection.cursor()
+        try:
+            copy_dataframe(cursor, df, stage, chunk_rows)
+        finally:
+            cursor.close()
+
+        written = len(df)
+        insert = f"INSERT INTO {target} ({_column_list(columns + [LOADED_AT])}) "
+        select = f"SELECT {cols}, :loaded_at FROM {stage}"
+        if mode == "replace":
+            # The deleted rows feed _stamped_select, so unchanged rows keep their stamp
+            conn.execute(text(
+                f"WITH previous AS (DELETE FROM {target} RETURNING *) "
+                + insert + _stamped_select(columns, stage, "previous")
+            ), {"loaded_at": stamp})
+        elif mode == "append":
+            conn.execute(text(insert + select), {"loaded_at": stamp})
+        else:
+            updates = [c for c in columns if c not in key]
+            conflict = f"ON CONFLICT ({_column_list(key)}) DO "
+            if updates:
+                assignments = ", ".join(f"{_quote(c)} = EXCLUDED.{_quote(c)}" for c in updates)
+                assignments += f", {LOADED_AT} = EXCLUDED.{LOADED_AT}"
+                changed = " OR ".join(f"{target}.{_quote(c)} IS DISTINCT FROM EXCLUDED.{_quote(c)}" for c in updates)
+                conflict += f"UPDATE SET {assignments} WHERE {changed}"
+            else:
+                conflict += "NOTHING"
+            # Conflicting rows skipped by the WHERE / DO NOTHING are not counted
+            written = conn.execute(text(f"{insert}{select} {conflict}"), {"loaded_at": stamp}).rowcount
+
+        if mode != "upsert" or written:
+            record_load(conn, table, len(df))
+
+    return written
@@ -0,0 +1,256 @@
+# data_ingestion/pipeline.py
+
+import hashlib
+import json
+import os
+import subprocess
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+
+from data_ingestion import fetch_ecb_hicp, fetch_eurostat_gdp, fetch_eurostat_population
+from data_ingestion.http_client import commit_cache_meta
+from data_ingestion.insert_cleaned_gdp import insert_cleaned_gdp
+from data_ingestion.load_population_to_postgres import load_population
+
+# Where per-stage wall times are appended (one JSON object per line)
+TIMINGS_PATH = os.path.join("logs", "ingestion_runs.jsonl")
+# Digest of the files each stage last succeeded on ({stage name: digest})
+STATE_PATH = os.path.join("data", "pipeline_state.json")
+DBT_PROJECT_DIR = "eurometrics_dbt"
+DEFAULT_WORKERS = 4
+
+# A stage runs when it has no dependencies (sources decide for themselves,
+# e.g. via the conditional-GET cache), when any dependency reported a change
+# in this run, or when its `files` (what it reads and writes) differ from
+# the last run it succeeded on, so a failed stage is retried by the next
+# run. run(ctx) returns True if it produced new output.
+Stage = namedtuple("Stage", ["name", "deps", "run", "files"], defaults=[()])
+
+
+def _file_digest(path):
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _files_digest(paths):
+    """One digest over the contents of `paths` (a missing file counts as its own value)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{path}={_file_digest(path)}\n".encode())
+    return digest.hexdigest()
+
+
+def _load_state():
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_state(state):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    tmp_path = f"{STATE_PATH}.part"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, STATE_PATH)
+
+
+def _engine(ctx):
+    # Built once by run_pipeline, before any stage thread starts
+    return ctx["engine"]
+
+
+# --- GDP -------------------------------------------------------------------
+
+def fetch_gdp(ctx):
+    changed = fetch_eurostat_gdp.download_gdp_tsv(force=ctx["force"])
+    return changed or not os.path.exists(fetch_eurostat_gdp.GDP_CLEAN_PATH)
+
+
+def clean_gdp(ctx):
+    fetch_eurostat_gdp.clean_gdp_tsv(fetch_eurostat_gdp.GDP_RAW_TSV_PATH)
+    return True
+
+
+def load_gdp(ctx):
+    insert_cleaned_gdp(_engine(ctx), mode="swap")
+    # The download's validators are kept only once its rows are in the database
+    commit_cache_meta(fetch_eurostat_gdp.GDP_RAW_TSV_PATH)
+    return True
+
+
+# --- HICP ------------------------------------------------------------------
+
+def fetch_hicp(ctx):
+    _, changed = fetch_ecb_hicp.fetch_regions(max_workers=ctx["workers"], force=ctx["force"])
+    return changed or not os.path.exists(fetch_ecb_hicp.CLEAN_PATH)
+
+
+def clean_hicp(ctx):
+    fetch_ecb_hicp.clean_hicp()
+    return True
+
+
+def load_hicp(ctx):
+    fetch_ecb_hicp.load_hicp(engine=_engine(ctx))
+    fetch_ecb_hicp.commit_regions()
+    return True
+
+
+# --- Population ------------------------------------------------------------
+
+POPULATION_PATH = "data/cleaned_population.csv"
+
+
+def fetch_population(ctx):
+    # demo_pjan is streamed and filtered straight into the cleaned file;
+    # report a change only if the cleaned rows actually differ
+    before = _file_digest(POPULATION_PATH)
+    fetch_eurostat_population.stream_population(output_path=POPULATION_PATH)
+    return ctx["force"] or _file_digest(POPULATION_PATH) != before
+
+
+def load_population_stage(ctx):
+    load_population(_engine(ctx))
+    return True
+
+
+# --- dbt -------------------------------------------------------------------
+
+def dbt_run(ctx):
+    subprocess.run(["dbt", "run"], cwd=DBT_PROJECT_DIR, check=True)
+    return True
+
+
+HICP_RAW_PATHS = tuple(fetch_ecb_hicp.raw_path_for(code) for code in fetch_ecb_hicp.REGION_MAP.values())
+CLEAN_PATHS = (fetch_eurostat_gdp.GDP_CLEAN_PATH, fetch_ecb_hicp.CLEAN_PATH, POPULATION_PATH)
+
+STAGES = [
+    Stage("gdp.fetch", [], fetch_gdp),
+    Stage("gdp.clean", ["gdp.fetch"], clean_gdp,
+          (fetch_eurostat_gdp.GDP_RAW_TSV_PATH, fetch_eurostat_gdp.GDP_CLEAN_PATH)),
+    Stage("gdp.load", ["gdp.clean"], load_gdp, (fetch_eurostat_gdp.GDP_CLEAN_PATH,)),
+    Stage("hicp.fetch", [], fetch_hicp),
+    Stage("hicp.clean", ["hicp.fetch"], clean_hicp, HICP_RAW_PATHS + (fetch_ecb_hicp.CLEAN_PATH,)),
+    Stage("hicp.load", ["hicp.clean"], load_hicp, (fetch_ecb_hicp.CLEAN_PATH,)),
+    Stage("population.fetch", [], fetch_population),
+    Stage("population.load", ["population.fetch"], load_population_stage, (POPULATION_PATH,)),
+    Stage("dbt.run", ["gdp.load", "hicp.load", "population.load"], dbt_run, CLEAN_PATHS),
+]
+
+
+def select_stages(stages, datasets=None, skip_dbt=False):
+    """Keep only the stages of `datasets` (prefix before the dot); dependencies outside the selection are dropped."""
+    selected = [
+        s for s in stages
+        if (datasets is None or s.name.split(".")[0] in datasets or s.name == "dbt.run")
+        and not (skip_dbt and s.name == "dbt.run")
+    ]
+    names = {s.name for s in selected}
+    return [s._replace(deps=[d for d in s.deps if d in names]) for s in selected]
+
+
+def needs_database(stages):
+    """Whether any of `stages` loads into PostgreSQL (and so needs a database URL)."""
+    return any(s.name.endswith(".load") for s in stages)
+
+
+def _record(run_id, result):
+    os.makedirs(os.path.dirname(TIMINGS_PATH), exist_ok=True)
+    with open(TIMINGS_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"run_id": run_id, **result}) + "\n")
+
+
+def run_pipeline(stages=STAGES, workers=DEFAULT_WORKERS, force=False, database_url=None):
+    """
+    Run `stages` as a DAG: every stage starts as soon as its dependencies are
+    done, so independent datasets run concurrently and the refresh takes as
+    long as its slowest chain. Stages whose inputs did not change since
+    they last succeeded are skipped, and a failure blocks only the stages
+    downstream of it.
+    Returns {stage name: status}. Raises ValueError up front if a load
+    stage is selected without a `database_url`.
+    """
+    if needs_database(stages) and not database_url:
+        raise ValueError("the load stages need a database URL (EUROMETRICS_DATABASE_URL)")
+    ctx = {
+        "force": force,
+        "workers": workers,
+        "database_url": database_url,
+        # Engines are thread-safe: one is shared by every load
+        "engine": create_engine(database_url) if needs_database(stages) else None,
+    }
+    state = _load_state()
+    run_id = uuid.uuid4().hex[:12]
+    status, changed = {}, {}
+    pending = list(stages)
+    running = {}
+    start = time.perf_counter()
+
+    def timed(stage):
+        started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        t0 = time.perf_counter()
+        result = stage.run(ctx)
+        seconds = time.perf_counter() - t0
+        # Taken after the run, so a stage's own output is part of what it succeeded on
+        return bool(result), started_at, seconds, _files_digest(stage.files)
+
+    def unchanged(stage):
+        return (not any(changed[dep] for dep in stage.deps)
+                and state.get(stage.name) == _files_digest(stage.files))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # Resolve every stage whose dependencies have all finished
+            for stage in list(pending):
+                if any(dep not in status for dep in stage.deps):
+                    continue
+                pending.remove(stage)
+                if any(status[dep] in ("failed", "blocked") for dep in stage.deps):
+                    status[stage.name] = "blocked"
+                    print(f"⛔ {stage.name} blocked by a failed dependency")
+                    _record(run_id, {"stage": stage.name, "status": "blocked", "seconds": 0.0})
+                elif stage.deps and not force and unchanged(stage):
+                    status[stage.name], changed[stage.name] = "skipped", False
+                    print(f"⏭️  {stage.name} skipped (inputs unchanged)")
+                    _record(run_id, {"stage": stage.name, "status": "skipped", "seconds": 0.0})
+                else:
+                    print(f"▶️  {stage.name}")
+                    running[pool.submit(timed, stage)] = stage
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    changed[stage.name], started_at, seconds, digest = future.result()
+                    status[stage.name] = "ran"
+                    if stage.files:
+                        state[stage.name] = digest
+                        _save_state(state)
+                    print(f"✅ {stage.name} finished in {seconds:.2f}s"
+                          f"{'' if changed[stage.name] else ' (no changes)'}")
+                    _record(run_id, {"stage": stage.name, "status": "ran", "changed": changed[stage.name],
+                                     "started_at": started_at, "seconds": round(seconds, 3)})
+                except Exception as e:
+                    status[stage.name] = "failed"
+                    print(f"❌ {stage.name} failed: {e}")
+                    _record(run_id, {"stage": stage.name, "status": "failed", "error": str(e)})
+
+    wall = time.perf_counter() - start
+    _record(run_id, {"stage": "total", "status": "done", "seconds": round(wall, 3)})
+    print(f"⏱️  Pipeline finished in {wall:.2f}s ({', '.join(f'{n}={s}' for n, s in status.items())})")
+    print(f"   Stage timings appended to {TIMINGS_PATH}")
+    return status
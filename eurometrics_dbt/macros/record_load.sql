@@ -0,0 +1,16 @@
+{#
+  Post-hook that stamps a model in ingestion_log, the table the loaders in
+  data_ingestion/pg_loader.py write to. The dashboard polls max(loaded_at)
+  there to know when its cached copy of the core tables is stale.
+#}
+{% macro record_load(relation) %}
+CREATE TABLE IF NOT EXISTS ingestion_log (
+    table_name text PRIMARY KEY,
+    loaded_at  timestamptz NOT NULL,
+    row_count  bigint
+);
+INSERT INTO ingestion_log (table_name, loaded_at, row_count)
+SELECT '{{ relation.identifier }}', now(), COUNT(*) FROM {{ relation }}
+ON CONFLICT (table_name) DO UPDATE
+SET loaded_at = EXCLUDED.loaded_at, row_count = EXCLUDED.row_count
+{% endmacro %}
@@ -1,17 +1,99 @@
-WITH gdp AS (
+{{
+  config(
+    materialized = "incremental",
+    unique_key = ["country", "year"],
+    incremental_strategy = "delete+insert",
+    indexes = [{"columns": ["country", "year"]}],
+    post_hook = [
+      "DELETE FROM {{ this }} c WHERE NOT EXISTS (SELECT 1 FROM {{ ref('stg_gdp_eurostat') }} g WHERE g.geo = c.country AND g.year = c.year)",
+      "ANALYZE {{ this }}",
+      "{{ record_load(this) }}"
+    ]
+  )
+}}
+
+-- The newest loaded_at of each source as this build sees it. The loaders
+-- stamp a table's loads in commit order (data_ingestion/pg_loader.py), so
+-- the next build only has to look at rows stamped later than this, including
+-- rows of a load that was still running while this one read the sources
+WITH seen AS (
+    SELECT
+        (SELECT MAX(loaded_at) FROM {{ ref('stg_gdp_eurostat') }})   AS gdp_loaded_at,
+        (SELECT MAX(loaded_at) FROM {{ ref('stg_hicp_inflation') }}) AS hicp_loaded_at,
+        (SELECT MAX(loaded_at) FROM {{ ref('stg_population') }})     AS population_loaded_at
+),
+
+{% if is_incremental() %}
+last_build AS (
+    SELECT
+        COALESCE(MAX(gdp_loaded_at), '-infinity'::timestamptz)        AS gdp,
+        COALESCE(MAX(hicp_loaded_at), '-infinity'::timestamptz)       AS hicp,
+        COALESCE(MAX(population_loaded_at), '-infinity'::timestamptz) AS population
+    FROM {{ this }}
+),
+
+hicp_months AS (
+    SELECT region AS country, EXTRACT(YEAR FROM date)::int AS year, COUNT(*) AS months
+    FROM {{ ref('stg_hicp_inflation') }}
+    GROUP BY 1, 2
+),
+
+-- Pairs that lost HICP months or their population row: removed rows leave
+-- no stamp behind, so compare with what each pair was built from. Pairs
+-- that lost their GDP row are deleted by the post-hook
+shrunk AS (
+    SELECT c.country, c.year
+    FROM {{ this }} c
+    LEFT JOIN hicp_months h
+        ON h.country = c.country
+       AND h.year    = c.year
+    WHERE c.hicp_months IS DISTINCT FROM h.months
+       OR (c.population IS NOT NULL AND NOT EXISTS (
+               SELECT 1 FROM {{ ref('stg_population') }} p
+               WHERE p.region = c.country AND p.year = c.year
+           ))
+),
+
+-- (country, year) pairs to recompute and replace (delete+insert on the
+-- unique key)
+touched AS (
+    SELECT geo AS country, year
+    FROM {{ ref('stg_gdp_eurostat') }}
+    WHERE loaded_at > (SELECT gdp FROM last_build)
+    UNION
+    SELECT region, EXTRACT(YEAR FROM date)::int
+    FROM {{ ref('stg_hicp_inflation') }}
+    WHERE loaded_at > (SELECT hicp FROM last_build)
+    UNION
+    SELECT region, year
+    FROM {{ ref('stg_population') }}
+    WHERE loaded_at > (SELECT population FROM last_build)
+    UNION
+    SELECT country, year FROM shrunk
+),
+
+{% endif %}
+gdp AS (
     SELECT
         geo      AS country,
         year,
         gdp_eur_millions
     FROM {{ ref('stg_gdp_eurostat') }}
+    {% if is_incremental() %}
+    WHERE (geo, year) IN (SELECT country, year FROM touched)
+    {% endif %}
 ),
 
 hicp AS (
     SELECT
         region   AS country,
         EXTRACT(YEAR FROM date)::int AS year,
-        AVG(hicp_index)             AS avg_hicp_index
+        AVG(hicp_index)             AS avg_hicp_index,
+        COUNT(*)                    AS months
     FROM {{ ref('stg_hicp_inflation') }}
+    {% if is_incremental() %}
+    WHERE (region, EXTRACT(YEAR FROM date)::int) IN (SELECT country, year FROM touched)
+    {% endif %}
     GROUP BY country, year
 ),
 
@@ -21,6 +103,9 @@ pop AS (
         year,
         population
     FROM {{ ref('stg_population') }}
+    {% if is_incremental() %}
+    WHERE (region, year) IN (SELECT country, year FROM touched)
+    {% endif %}
 )
 
 SELECT
@@ -29,7 +114,11 @@ SELECT
     g.gdp_eur_millions,
     h.avg_hicp_index,
     p.population,
-    (g.gdp_eur_millions * 1000000) / p.population AS gdp_per_capita
+    (g.gdp_eur_millions * 1000000) / p.population AS gdp_per_capita,
+    h.months AS hicp_months,
+    s.gdp_loaded_at,
+    s.hicp_loaded_at,
+    s.population_loaded_at
 FROM gdp g
 LEFT JOIN hicp h
     ON g.country = h.country
@@ -37,4 +126,4 @@ LEFT JOIN hicp h
 LEFT JOIN pop p
     ON g.country = p.country
    AND g.year    = p.year
-ORDER BY g.country, g.year
+CROSS JOIN seen s
@@ -0,0 +1,69 @@
+{{
+  config(
+    materialized = "table",
+    indexes = [{"columns": ["country", "month"], "unique": true}],
+    post_hook = [
+      "ANALYZE {{ this }}",
+      "{{ record_load(this) }}"
+    ]
+  )
+}}
+
+-- Monthly HICP with inflation rates precomputed, so the dashboard reads a
+-- (country, month) range instead of recomputing them from hicp_inflation.
+-- Lags are only used when they point at exactly 1 / 12 months earlier, so a
+-- gap in the series gives NULL instead of a rate over the wrong period.
+
+WITH hicp AS (
+    SELECT
+        region     AS country,
+        date       AS month,
+        -- float8 rather than numeric: cheaper windows, and plain floats in pandas
+        hicp_index::double precision AS hicp_index
+    FROM {{ ref('stg_hicp_inflation') }}
+    WHERE hicp_index IS NOT NULL
+),
+
+lagged AS (
+    SELECT
+        country,
+        month,
+        hicp_index,
+        LAG(month, 1)       OVER w AS prev_month,
+        LAG(hicp_index, 1)  OVER w AS prev_index,
+        LAG(month, 12)      OVER w AS prev_year_month,
+        LAG(hicp_index, 12) OVER w AS prev_year_index,
+        AVG(hicp_index) OVER (
+            PARTITION BY country ORDER BY month
+            RANGE BETWEEN INTERVAL '11 months' PRECEDING AND CURRENT ROW
+        ) AS avg_12m_index
+    FROM hicp
+    WINDOW w AS (PARTITION BY country ORDER BY month)
+),
+
+rates AS (
+    SELECT
+        country,
+        month,
+        hicp_index,
+        CASE WHEN prev_month = month - INTERVAL '1 month'
+             THEN (hicp_index / NULLIF(prev_index, 0) - 1) * 100 END      AS mom_rate_pct,
+        CASE WHEN prev_year_month = month - INTERVAL '12 months'
+             THEN (hicp_index / NULLIF(prev_year_index, 0) - 1) * 100 END AS yoy_rate_pct,
+        avg_12m_index
+    FROM lagged
+)
+
+SELECT
+    country,
+    month,
+    EXTRACT(YEAR FROM month)::int AS year,
+    hicp_index,
+    mom_rate_pct,
+    yoy_rate_pct,
+    AVG(yoy_rate_pct) OVER (
+        PARTITION BY country ORDER BY month
+        RANGE BETWEEN INTERVAL '11 months' PRECEDING AND CURRENT ROW
+    ) AS avg_12m_yoy_rate_pct,
+    avg_12m_index
+FROM rates
@@ -0,0 +1,60 @@
+{{
+  config(
+    materialized = "table",
+    indexes = [{"columns": ["grain", "country", "year", "decade"]}],
+    post_hook = [
+      "ANALYZE {{ this }}",
+      "{{ record_load(this) }}"
+    ]
+  )
+}}
+
+-- Per-country / per-year / per-decade aggregates of every indicator, so the
+-- dashboard's summary tables and heatmaps read a few pre-aggregated rows
+-- instead of re-grouping the base table on every interaction. Sums, counts
+-- and sums of squares are kept so means and standard deviations can be
+-- recombined over any filtered subset of cells (see dashboard/rollup.py).
+
+{% set metrics = ["gdp_eur_millions", "gdp_per_capita", "avg_hicp_index", "population"] %}
+
+WITH base AS (
+    SELECT
+        country,
+        year,
+        -- year - year % 10 rather than (year / 10) * 10: "/" is float division on DuckDB
+        year - year % 10 AS decade,
+        {% for metric in metrics %}
+        {{ metric }}::double precision AS {{ metric }}{{ "," if not loop.last }}
+        {% endfor %}
+    FROM {{ ref('core_economic_indicators') }}
+)
+
+SELECT
+    CASE GROUPING(country, year, decade)
+        WHEN 1 THEN 'country_year'
+        WHEN 2 THEN 'country_decade'
+        WHEN 3 THEN 'country'
+        WHEN 5 THEN 'year'
+        WHEN 6 THEN 'decade'
+        ELSE 'all'
+    END AS grain,
+    country,
+    year,
+    decade,
+    {% for metric in metrics %}
+    SUM({{ metric }})                  AS {{ metric }}_sum,
+    AVG({{ metric }})                  AS {{ metric }}_mean,
+    MIN({{ metric }})                  AS {{ metric }}_min,
+    MAX({{ metric }})                  AS {{ metric }}_max,
+    COUNT({{ metric }})                AS {{ metric }}_count,
+    SUM({{ metric }} * {{ metric }})   AS {{ metric }}_sumsq{{ "," if not loop.last }}
+    {% endfor %}
+FROM base
+GROUP BY GROUPING SETS (
+    (country, year),
+    (country, decade),
+    (country),
+    (year),
+    (decade),
+    ()
+)
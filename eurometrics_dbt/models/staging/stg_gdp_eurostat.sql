@@ -12,7 +12,8 @@ renamed as (
     select
         EXTRACT(YEAR FROM year)::int     as year,
         geo,
-        cast(value as numeric)            as gdp_eur_millions
+        cast(value as numeric)            as gdp_eur_millions,
+        loaded_at
     from source
 
 )
@@ -12,7 +12,8 @@ renamed as (
     select
         date::date as date,
         region,
-        cast(hicp_index as numeric) as hicp_index
+        cast(hicp_index as numeric) as hicp_index,
+        loaded_at
     from source
 
 )
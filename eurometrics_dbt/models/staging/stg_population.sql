@@ -15,5 +15,6 @@ with raw as (
 select
   region,
   year::int      as year,
-  population::int as population
+  population::int as population,
+  loaded_at
 from raw
@@ -1,8 +1,11 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
 
+from dashboard import charts
+from dashboard.data_access import current_filters, filter_key, latest_year, load_indicators
+from dashboard.downsample import point_budget
+from dashboard.rollup import get_rollup, describe, summarize
+
 st.set_page_config(page_title="Comparative Analysis", page_icon="🇪🇺", layout="wide")
 
 # Custom CSS for EU theme
@@ -31,23 +34,25 @@ st.markdown("""
 st.title("Comparative Analysis")
 st.markdown("### Compare economic indicators across regions and time periods")
 
-# Get data from session state
-if 'filtered_df' not in st.session_state:
-    st.error("Please go to the main page first to load the data.")
-    st.stop()
-
-df = st.session_state.filtered_df
-region_col = st.session_state.region_col
+# Filters chosen on Overview (everything if the page is opened directly);
+# the rows come from the shared caches, not from session state
+countries_filter, year_range = current_filters()
+df = load_indicators(countries_filter, year_range)
 
 if df.empty:
     st.warning("No data available for the selected filters.")
     st.stop()
 
+# Summaries come from the pre-aggregated rollup, restricted to the sidebar filters
+rollup = get_rollup()
+selected = countries_filter
+year_range = year_range or (int(df['year'].min()), int(df['year'].max()))
+
 # Comparison controls
 st.subheader("Comparison Settings")
 
-# EU color palette
-eu_colors = ['#003399', '#FFDD00', '#CC0000', '#009900', '#FF6600', '#9900CC', '#00CCCC']
+# Figures are cached per (chart, filters, data version) in dashboard/charts.py
+key = filter_key(countries_filter, year_range)
 
 col1, col2 = st.columns(2)
 
@@ -69,30 +74,20 @@ if not metrics_to_compare:
     st.stop()
 
 # Comparison visualizations
-if comparison_type == "By Region" and region_col:
+if comparison_type == "By Region":
     st.subheader("Regional Comparison")
     
     # Latest year comparison
-    latest_year = df['year'].max()
-    latest_data = df[df['year'] == latest_year]
+    latest = latest_year(countries_filter, year_range)
+    latest_data = load_indicators(countries_filter, (latest, latest))
     
     for metric in metrics_to_compare:
         if metric in latest_data.columns:
-            st.subheader(f"{metric.replace('_', ' ').title()} - {latest_year}")
+            st.subheader(f"{metric.replace('_', ' ').title()} - {latest}")
             
-            fig = px.bar(
-                latest_data,
-                x=region_col,
-                y=metric,
-                title=f"{metric.replace('_', ' ').title()} by Region ({latest_year})",
-                color=metric,
-                color_continuous_scale="Blues"
-            )
-            fig.update_layout(
-                height=400,
-                plot_bgcolor='rgba(248,249,255,0.8)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                title_font_color='#003399'
+            fig = charts.bar(
+                latest_data, (key, latest), x='country', y=metric, color=metric,
+                title=f"{metric.replace('_', ' ').title()} by Region ({latest})"
             )
             st.plotly_chart(fig, use_container_width=True)
 
@@ -103,32 +98,9 @@ elif comparison_type == "By Year":
         if metric in df.columns:
             st.subheader(f"{metric.replace('_', ' ').title()} Trends")
             
-            if region_col:
-                fig = px.line(
-                    df,
-                    x='year',
-                    y=metric,
-                    color=region_col,
-                    title=f"{metric.replace('_', ' ').title()} Over Time by Region",
-                    markers=True,
-                    color_discrete_sequence=eu_colors
-                )
-            else:
-                yearly_avg = df.groupby('year')[metric].mean().reset_index()
-                fig = px.line(
-                    yearly_avg,
-                    x='year',
-                    y=metric,
-                    title=f"Average {metric.replace('_', ' ').title()} Over Time",
-                    markers=True,
-                    color_discrete_sequence=['#003399']
-                )
-            
-            fig.update_layout(
-                height=400,
-                plot_bgcolor='rgba(248,249,255,0.8)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                title_font_color='#003399'
+            fig = charts.line(
+                df, key, x='year', y=metric, color='country',
+                title=f"{metric.replace('_', ' ').title()} Over Time by Region", points=point_budget()
             )
             st.plotly_chart(fig, use_container_width=True)
 
@@ -139,16 +111,8 @@ elif comparison_type == "Correlation Analysis":
         # Correlation matrix
         correlation_data = df[metrics_to_compare].corr()
         
-        fig_corr = px.imshow(
-            correlation_data,
-            text_auto=True,
-            aspect="auto",
-            title="Correlation Matrix",
-            color_continuous_scale="Blues"
-        )
-        fig_corr.update_layout(
-            height=500,
-            title_font_color='#003399'
+        fig_corr = charts.heatmap(
+            correlation_data, (key, tuple(metrics_to_compare)), title="Correlation Matrix", text_auto=True
         )
         st.plotly_chart(fig_corr, use_container_width=True)
         
@@ -156,23 +120,11 @@ elif comparison_type == "Correlation Analysis":
         if len(metrics_to_compare) == 2:
             metric1, metric2 = metrics_to_compare
             
-            if region_col:
-                fig_scatter = px.scatter(
-                    df,
-                    x=metric1,
-                    y=metric2,
-                    color=region_col,
-                    size='population' if 'population' in df.columns else None,
-                    title=f"{metric1.replace('_', ' ').title()} vs {metric2.replace('_', ' ').title()}"
-                )
-            else:
-                fig_scatter = px.scatter(
-                    df,
-                    x=metric1,
-                    y=metric2,
-                    title=f"{metric1.replace('_', ' ').title()} vs {metric2.replace('_', ' ').title()}"
-                )
-            
+            title = f"{metric1.replace('_', ' ').title()} vs {metric2.replace('_', ' ').title()}"
+            fig_scatter = charts.scatter(
+                df, key, x=metric1, y=metric2, color='country',
+                size='population' if 'population' in df.columns else None, title=title
+            )
             st.plotly_chart(fig_scatter, use_container_width=True)
     else:
         st.warning("Please select at least 2 metrics for correlation analysis.")
@@ -180,21 +132,23 @@ elif comparison_type == "Correlation Analysis":
 # Summary statistics
 st.subheader("Summary Statistics")
 
-summary_stats = df[metrics_to_compare].describe()
+summary_stats = describe(rollup, metrics_to_compare, countries=selected, year_range=year_range)
 st.dataframe(summary_stats, use_container_width=True)
 
 # Ranking table
-if region_col and comparison_type == "By Region":
+if comparison_type == "By Region":
     st.subheader("Regional Rankings 🇫🇷 🇩🇪")
     
-    latest_year = df['year'].max()
-    latest_data = df[df['year'] == latest_year]
+    latest = latest_year(countries_filter, year_range)
+    latest_data = summarize(rollup, metrics_to_compare, by=['country'], countries=selected,
+                            year_range=(latest, latest))
     
     for metric in metrics_to_compare:
-        if metric in latest_data.columns:
-            ranking = latest_data.groupby(region_col)[metric].mean().sort_values(ascending=False).reset_index()
+        if f'{metric}_mean' in latest_data.columns:
+            ranking = latest_data[['country', f'{metric}_mean']].rename(columns={f'{metric}_mean': metric})
+            ranking = ranking.sort_values(metric, ascending=False).reset_index(drop=True)
             ranking['Rank'] = range(1, len(ranking) + 1)
-            ranking = ranking[['Rank', region_col, metric]]
+            ranking = ranking[['Rank', 'country', metric]]
             
             st.subheader(f"Top Rankings - {metric.replace('_', ' ').title()}")
             st.dataframe(ranking, use_container_width=True, hide_index=True)
\ No newline at end of file
@@ -1,6 +1,12 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+
+from dashboard import charts
+from dashboard.data_access import (
+    current_filters, filter_key, get_indicators, load_indicators, load_profile, search_indicators,
+)
+from dashboard.export import EXPORT_FORMATS, export_file
+from dashboard.pagination import PAGE_SIZES, get_page, page_count, sort_order
 
 st.set_page_config(page_title="Data Explorer", page_icon="🇪🇺", layout="wide")
 
@@ -30,14 +36,15 @@ st.markdown("""
 st.title("Data Explorer")
 st.markdown("### Explore and analyze your economic data in detail")
 
-# Get data from session state
-if 'df' not in st.session_state:
-    st.error("Please go to the main page first to load the data.")
-    st.stop()
+# The whole table, for the dataset-level overview (shared by all sessions),
+# and the rows matching the Overview filters (everything if opened directly)
+df = get_indicators()
+filters = current_filters()
+filtered_df = load_indicators(*filters)
 
-df = st.session_state.df
-filtered_df = st.session_state.filtered_df
-region_col = st.session_state.region_col
+# Schema, null counts and summary statistics, computed once per data version
+profile = load_profile()
+filtered_profile = load_profile(*filters)
 
 # Data overview
 st.subheader("Dataset Overview")
@@ -45,17 +52,16 @@ st.subheader("Dataset Overview")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Total Records", len(df))
+    st.metric("Total Records", profile.rows)
 
 with col2:
-    st.metric("Filtered Records", len(filtered_df))
+    st.metric("Filtered Records", filtered_profile.rows)
 
 with col3:
-    st.metric("Number of Columns", len(df.columns))
+    st.metric("Number of Columns", profile.n_columns)
 
 with col4:
-    years_span = df['year'].max() - df['year'].min() + 1
-    st.metric("Years Covered", years_span)
+    st.metric("Years Covered", profile.year_span)
 
 # Data structure
 st.subheader("Data Structure")
@@ -64,28 +70,13 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.write("**Column Information:**")
-    column_info = pd.DataFrame({
-        'Column': df.columns,
-        'Data Type': df.dtypes,
-        'Non-Null Count': df.count(),
-        'Null Count': df.isnull().sum()
-    })
-    st.dataframe(column_info, use_container_width=True)
+    st.dataframe(profile.columns, use_container_width=True)
 
 with col2:
     st.write("**Data Quality:**")
-    total_cells = len(df) * len(df.columns)
-    null_cells = df.isnull().sum().sum()
-    completeness = ((total_cells - null_cells) / total_cells) * 100
-    
-    st.metric("Data Completeness", f"{completeness:.1f}%")
-    
-    if region_col:
-        unique_regions = df[region_col].nunique()
-        st.metric("Unique Regions", unique_regions)
-    
-    unique_years = df['year'].nunique()
-    st.metric("Unique Years", unique_years)
+    st.metric("Data Completeness", f"{profile.completeness:.1f}%")
+    st.metric("Unique Regions", profile.unique['country'])
+    st.metric("Unique Years", profile.unique['year'])
 
 # Interactive data exploration
 st.subheader("Interactive Data Explorer")
@@ -99,31 +90,47 @@ columns_to_show = st.multiselect(
 
 # Sorting options
 sort_column = st.selectbox("Sort by:", df.columns.tolist(), index=0)
-sort_order = st.radio("Sort order:", ["Ascending", "Descending"])
+sort_order_choice = st.radio("Sort order:", ["Ascending", "Descending"])
 
-# Apply sorting
-if sort_order == "Ascending":
-    display_df = filtered_df[columns_to_show].sort_values(sort_column)
-else:
-    display_df = filtered_df[columns_to_show].sort_values(sort_column, ascending=False)
+# Pagination: the sort order is cached per (filters, column, direction) and
+# only the visible page is sliced out and sent to the browser
+col1, col2 = st.columns(2)
+with col1:
+    page_size = st.selectbox("Rows per page:", PAGE_SIZES, index=1)
+n_pages = page_count(len(filtered_df), page_size)
+if st.session_state.get("explorer_page", 1) > n_pages:
+    st.session_state.explorer_page = n_pages
+with col2:
+    page = st.number_input("Page:", min_value=1, max_value=n_pages, step=1, key="explorer_page")
+
+order = sort_order(filtered_df, filter_key(*filters), sort_column, ascending=sort_order_choice == "Ascending")
+display_df = get_page(filtered_df, order, page, page_size, columns_to_show)
 
 # Display data
 st.subheader("Filtered Data")
+first_row = (page - 1) * page_size
+st.caption(
+    f"Page {page:,} of {n_pages:,} · rows {min(first_row + 1, len(filtered_df)):,}–"
+    f"{first_row + len(display_df):,} of {len(filtered_df):,}"
+)
 st.dataframe(display_df, use_container_width=True, height=400)
 
-# Download option
-csv = display_df.to_csv(index=False)
+# Download option (every filtered row, in the chosen order). The file is only
+# written when the button is clicked, and cached for the same selection
+export_format = st.radio("Download format:", list(EXPORT_FORMATS), horizontal=True)
+extension, mime = EXPORT_FORMATS[export_format]
+export_key = (filter_key(*filters), sort_column, sort_order_choice)
 st.download_button(
-    label="📥 Download filtered data as CSV",
-    data=csv,
-    file_name='eurometrics_filtered_data.csv',
-    mime='text/csv'
+    label=f"📥 Download filtered data as {export_format}",
+    data=lambda: export_file(filtered_df, order, export_key, tuple(columns_to_show), export_format),
+    file_name=f'eurometrics_filtered_data{extension}',
+    mime=mime
 )
 
 # Statistical summary
 st.subheader("Statistical Summary")
 
-numeric_columns = df.select_dtypes(include=['number']).columns.tolist()
+numeric_columns = profile.describe.columns.tolist()
 if 'year' in numeric_columns:
     numeric_columns.remove('year')  # Remove year from statistical analysis
 
@@ -135,44 +142,31 @@ if numeric_columns:
     )
     
     if selected_numeric_cols:
-        stats_df = filtered_df[selected_numeric_cols].describe()
+        stats_df = filtered_profile.describe[selected_numeric_cols]
         st.dataframe(stats_df, use_container_width=True)
         
         # Histograms
         st.subheader("Distribution Analysis")
         
         for col in selected_numeric_cols:
-            fig = px.histogram(
-                filtered_df,
-                x=col,
-                title=f"Distribution of {col.replace('_', ' ').title()}",
-                nbins=30
+            # Cached on the filters, so sorting or re-ordering columns reuses it
+            fig = charts.histogram(
+                filtered_df, filter_key(*filters), x=col,
+                title=f"Distribution of {col.replace('_', ' ').title()}", nbins=30, height=300
             )
-            fig.update_layout(height=300)
             st.plotly_chart(fig, use_container_width=True)
 
 # Missing data analysis
 st.subheader("Missing Data Analysis")
 
-missing_data = df.isnull().sum()
-missing_data = missing_data[missing_data > 0].sort_values(ascending=False)
+missing_df = profile.missing
 
-if len(missing_data) > 0:
+if len(missing_df) > 0:
     st.write("**Columns with missing data:**")
-    missing_df = pd.DataFrame({
-        'Column': missing_data.index,
-        'Missing Count': missing_data.values,
-        'Missing Percentage': (missing_data.values / len(df) * 100).round(2)
-    })
     st.dataframe(missing_df, use_container_width=True, hide_index=True)
     
     # Visualization of missing data
-    fig = px.bar(
-        missing_df,
-        x='Column',
-        y='Missing Percentage',
-        title="Missing Data by Column (%)"
-    )
+    fig = charts.bar(missing_df, filter_key(), x='Column', y='Missing Percentage', title="Missing Data by Column (%)")
     st.plotly_chart(fig, use_container_width=True)
 else:
     st.success("No missing data found in the dataset!")
@@ -181,19 +175,24 @@ else:
 st.subheader("🔎 Search Data")
 
 search_column = st.selectbox("Search in column:", df.columns.tolist())
-search_term = st.text_input(f"Search for values in {search_column}:")
+search_term = st.text_input(
+    f"Search for values in {search_column}:",
+    help="Text columns: part of the value. Numeric columns: a number or a range such as 100..200, >=100 or <50."
+)
+
+# Matches beyond this are counted but not sent to the browser
+SEARCH_PREVIEW_ROWS = 1000
 
 if search_term:
-    if df[search_column].dtype == 'object':
-        search_results = df[df[search_column].str.contains(search_term, case=False, na=False)]
-    else:
-        try:
-            search_value = float(search_term)
-            search_results = df[df[search_column] == search_value]
-        except ValueError:
-            st.error("Please enter a valid number for numeric columns.")
-            search_results = pd.DataFrame()
+    # Answered from a per-column index built once per data version (dashboard/search.py)
+    try:
+        search_results = search_indicators(search_column, search_term)
+    except ValueError:
+        st.error("Please enter a number or a range (e.g. 100..200, >=100) for numeric columns.")
+        search_results = pd.DataFrame()
     
     st.write(f"Found {len(search_results)} matching records:")
     if len(search_results) > 0:
-        st.dataframe(search_results, use_container_width=True)
\ No newline at end of file
+        if len(search_results) > SEARCH_PREVIEW_ROWS:
+            st.caption(f"Showing the first {SEARCH_PREVIEW_ROWS:,}.")
+        st.dataframe(search_results.head(SEARCH_PREVIEW_ROWS), use_container_width=True)
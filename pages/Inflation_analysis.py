@@ -1,6 +1,10 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
+import pandas as pd
+
+from dashboard import charts
+from dashboard.data_access import current_filters, filter_key, load_hicp_monthly, load_indicators
+from dashboard.downsample import point_budget
+from dashboard.rollup import get_rollup, pivot, summarize
 
 st.set_page_config(page_title="Inflation Analysis", page_icon="🇪🇺", layout="wide")
 
@@ -30,17 +34,26 @@ st.markdown("""
 st.title("Inflation Analysis")
 st.markdown("### Detailed analysis of HICP (Harmonised Index of Consumer Prices)")
 
-# Get data from session state
-if 'filtered_df' not in st.session_state:
-    st.error("Please go to the main page first to load the data.")
+# Filters chosen on Overview (everything if the page is opened directly);
+# the rows come from the shared caches, not from session state
+countries_filter, year_range = current_filters()
+df = load_indicators(countries_filter, year_range)
+
+if df.empty:
+    st.warning("No data available for the selected filters.")
     st.stop()
 
-df = st.session_state.filtered_df
-region_col = st.session_state.region_col
+# Summaries come from the pre-aggregated rollup, restricted to the sidebar filters
+rollup = get_rollup()
+selected = countries_filter
+year_range = year_range or (int(df['year'].min()), int(df['year'].max()))
+hicp_summary = summarize(rollup, ['avg_hicp_index'], countries=selected, year_range=year_range)
 
-if df.empty:
+# The rollup can lag behind the indicators table until dbt rebuilds it
+if hicp_summary.empty:
     st.warning("No data available for the selected filters.")
     st.stop()
+hicp_summary = hicp_summary.iloc[0]
 
 # Inflation metrics
 st.subheader("Inflation Overview")
@@ -48,127 +61,88 @@ st.subheader("Inflation Overview")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    avg_inflation = df['avg_hicp_index'].mean()
+    avg_inflation = hicp_summary['avg_hicp_index_mean']
     st.metric("Average HICP", f"{avg_inflation:.2f}")
 
 with col2:
-    max_inflation = df['avg_hicp_index'].max()
+    max_inflation = hicp_summary['avg_hicp_index_max']
     st.metric("Highest HICP", f"{max_inflation:.2f}")
 
 with col3:
-    min_inflation = df['avg_hicp_index'].min()
+    min_inflation = hicp_summary['avg_hicp_index_min']
     st.metric("Lowest HICP", f"{min_inflation:.2f}")
 
 with col4:
     inflation_range = max_inflation - min_inflation
     st.metric("HICP Range", f"{inflation_range:.2f}")
 
-# Charts with EU color theme
-eu_colors = ['#003399', '#FFDD00', '#CC0000', '#009900', '#FF6600', '#9900CC', '#00CCCC']
+# Figures are cached per (chart, filters, data version) in dashboard/charts.py
+key = filter_key(countries_filter, year_range)
 
 col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("HICP Over Time")
-    if region_col:
-        fig_hicp = px.line(
-            df, 
-            x="year", 
-            y="avg_hicp_index", 
-            color=region_col,
-            title="HICP Index by Region",
-            markers=True,
-            color_discrete_sequence=eu_colors
-        )
-    else:
-        fig_hicp = px.line(
-            df, 
-            x="year", 
-            y="avg_hicp_index",
-            title="HICP Index Over Time",
-            markers=True,
-            color_discrete_sequence=['#003399']
-        )
-    fig_hicp.update_layout(
-        height=400,
-        plot_bgcolor='rgba(248,249,255,0.8)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        title_font_color='#003399'
+    fig_hicp = charts.line(
+        df, key, x="year", y="avg_hicp_index", color="country",
+        title="HICP Index by Region", points=point_budget(0.5)
     )
     st.plotly_chart(fig_hicp, use_container_width=True)
 
 with col2:
     st.subheader("HICP Distribution")
-    if region_col:
-        fig_box = px.box(
-            df, 
-            x=region_col, 
-            y="avg_hicp_index",
-            title="HICP Distribution by Region",
-            color_discrete_sequence=eu_colors
-        )
-    else:
-        fig_box = px.histogram(
-            df, 
-            x="avg_hicp_index",
-            title="HICP Distribution",
-            nbins=20,
-            color_discrete_sequence=['#003399']
-        )
-    fig_box.update_layout(
-        height=400,
-        plot_bgcolor='rgba(248,249,255,0.8)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        title_font_color='#003399'
-    )
+    fig_box = charts.box(df, key, x="country", y="avg_hicp_index", title="HICP Distribution by Region")
     st.plotly_chart(fig_box, use_container_width=True)
 
+# Monthly inflation rates, precomputed in core_hicp_monthly
+st.subheader("Monthly Inflation Rates")
+
+countries = tuple(sorted(df["country"].unique()))
+try:
+    monthly = load_hicp_monthly(countries, year_range[0], year_range[1])
+except Exception as e:
+    st.error(f"Could not load monthly HICP data: {e}")
+    monthly = None
+
+if monthly is None or monthly.empty:
+    st.info("No monthly HICP data available for the selected filters.")
+else:
+    latest = monthly.sort_values("month").groupby("country").tail(1)
+    rate_cols = st.columns(len(latest))
+    for col, (_, row) in zip(rate_cols, latest.iterrows()):
+        with col:
+            st.metric(
+                f"{row['country']} YoY ({row['month']:%b %Y})",
+                f"{row['yoy_rate_pct']:.1f}%" if pd.notna(row['yoy_rate_pct']) else "n/a",
+                f"{row['mom_rate_pct']:+.2f}% MoM" if pd.notna(row['mom_rate_pct']) else None
+            )
+
+    fig_rates = charts.rates(
+        monthly, key, y="yoy_rate_pct", average="avg_12m_yoy_rate_pct",
+        title="Year-over-Year Inflation Rate (%)", yaxis_title="%", points=point_budget()
+    )
+    st.plotly_chart(fig_rates, use_container_width=True)
+
 # Yearly comparison
 st.subheader("Year-over-Year Analysis")
 
-if region_col and len(df[region_col].unique()) > 1:
+if len(df["country"].unique()) > 1:
     # Heatmap of inflation by region and year
-    pivot_data = df.pivot_table(
-        values='avg_hicp_index', 
-        index=region_col, 
-        columns='year', 
-        aggfunc='mean'
-    )
+    pivot_data = pivot(rollup, 'avg_hicp_index', countries=selected, year_range=year_range)
     
-    fig_heatmap = px.imshow(
-        pivot_data,
-        aspect="auto",
-        title="HICP Heatmap by Region and Year",
-        color_continuous_scale="Blues"
-    )
-    fig_heatmap.update_layout(
-        height=500,
-        title_font_color='#003399'
-    )
+    fig_heatmap = charts.heatmap(pivot_data, key, title="HICP Heatmap by Region and Year")
     st.plotly_chart(fig_heatmap, use_container_width=True)
 else:
     # Simple year-over-year comparison
-    yearly_avg = df.groupby('year')['avg_hicp_index'].mean().reset_index()
-    fig_yearly = px.bar(
-        yearly_avg,
-        x='year',
-        y='avg_hicp_index',
-        title="Average HICP by Year",
-        color_discrete_sequence=['#003399']
-    )
-    fig_yearly.update_layout(
-        height=400,
-        plot_bgcolor='rgba(248,249,255,0.8)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        title_font_color='#003399'
-    )
+    yearly_avg = summarize(rollup, ['avg_hicp_index'], by=['year'], countries=selected, year_range=year_range)
+    yearly_avg = yearly_avg.rename(columns={'avg_hicp_index_mean': 'avg_hicp_index'})
+    fig_yearly = charts.bar(yearly_avg, key, x='year', y='avg_hicp_index', title="Average HICP by Year")
     st.plotly_chart(fig_yearly, use_container_width=True)
 
 # Data table
 st.subheader("Detailed Data")
-if region_col:
-    summary_stats = df.groupby([region_col, 'year'])['avg_hicp_index'].agg(['mean', 'min', 'max']).round(2)
-    st.dataframe(summary_stats, use_container_width=True)
-else:
-    yearly_stats = df.groupby('year')['avg_hicp_index'].agg(['mean', 'min', 'max']).round(2)
-    st.dataframe(yearly_stats, use_container_width=True)
\ No newline at end of file
+stat_columns = {'avg_hicp_index_mean': 'mean', 'avg_hicp_index_min': 'min', 'avg_hicp_index_max': 'max'}
+summary_stats = summarize(rollup, ['avg_hicp_index'], by=['country', 'year'], countries=selected, year_range=year_range)
+summary_stats = summary_stats.rename(columns=stat_columns)
+summary_stats = summary_stats.set_index(['country', 'year'])[['mean', 'min', 'max']].round(2)
+st.dataframe(summary_stats, use_container_width=True)
\ No newline at end of file
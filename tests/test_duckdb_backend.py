@@ -0,0 +1,78 @@
+# tests/test_duckdb_backend.py
+#
+# The dbt models built into DuckDB from the files in data/, checked against
+# the cleaned CSVs they are built from.
+
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from dashboard import duckdb_backend  # noqa: E402
+from data_ingestion.parquet_store import CLEANED_CSVS  # noqa: E402
+
+REPO = os.path.join(os.path.dirname(__file__), os.pardir)
+
+
+@pytest.fixture(scope="module")
+def con():
+    # The backend reads data/ and eurometrics_dbt/ relative to the working directory
+    cwd = os.getcwd()
+    os.chdir(REPO)
+    try:
+        con = duckdb_backend.build_database()
+        yield con
+    finally:
+        os.chdir(cwd)
+    con.close()
+
+
+@pytest.fixture(scope="module")
+def indicators(con):
+    return duckdb_backend.read_query(con, "SELECT * FROM core_economic_indicators ORDER BY country, year")
+
+
+def _csv(dataset):
+    return pd.read_csv(os.path.join(REPO, CLEANED_CSVS[dataset]))
+
+
+def test_every_model_is_built(con):
+    built = {row[0] for row in con.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+    assert {os.path.basename(model) for model in duckdb_backend.MODELS} <= built
+
+
+def test_one_row_per_gdp_observation(indicators):
+    gdp = _csv("gdp")
+    assert len(indicators) == len(gdp) == 30
+    assert not indicators.duplicated(["country", "year"]).any()
+    assert indicators.groupby("country")["year"].agg(["min", "max", "count"]).loc["FR"].tolist() == [1975, 2022, 22]
+
+
+def test_spot_values(indicators):
+    row = indicators.set_index(["country", "year"]).loc[("FR", 2022)]
+    hicp = _csv("hicp")
+    fr_2022 = hicp[(hicp["region"] == "FR") & hicp["date"].str.startswith("2022")]["hicp_index"]
+
+    assert float(row["gdp_eur_millions"]) == pytest.approx(2653997.2)
+    assert row["population"] == 68091703
+    assert row["gdp_per_capita"] == pytest.approx(2653997.2e6 / 68091703)
+    assert row["avg_hicp_index"] == pytest.approx(fr_2022.mean())
+    assert row["hicp_months"] == len(fr_2022) == 12
+
+
+def test_missing_sources_give_nulls(indicators):
+    # HICP in data/ starts in 1996, after the first German GDP rows
+    row = indicators.set_index(["country", "year"]).loc[("DE", 1991)]
+    assert pd.isna(row["avg_hicp_index"]) and pd.isna(row["hicp_months"])
+    assert row["population"] == 79753227
+
+
+def test_read_query_rewrites_psycopg2_placeholders(con):
+    df = duckdb_backend.read_query(
+        con,
+        "SELECT country, year FROM core_economic_indicators WHERE country = %(country)s AND year >= %(year)s",
+        {"country": "EA19", "year": 2023},
+    )
+    assert sorted(df["year"]) == [2023, 2024]
@@ -0,0 +1,71 @@
+# tests/test_eurostat_tsv.py
+#
+# The Eurostat TSV parser against the NAMA_10_GDP extract in data/.
+
+import math
+import os
+
+import pyarrow as pa
+import pytest
+
+from data_ingestion.eurostat_tsv import iter_records, read_tsv, split_cells
+
+GDP_TSV = os.path.join(os.path.dirname(__file__), os.pardir, "data", "eurostat_gdp_raw.tsv")
+
+# 3 series (DE, EA19, FR) x 50 years (1975-2024); DE starts in 1991, EA19 in 1995
+SERIES, PERIODS, MISSING = 3, 50, 16 + 20
+
+
+@pytest.fixture
+def gdp():
+    return read_tsv(GDP_TSV)
+
+
+def test_read_tsv_shape_and_dimensions(gdp):
+    assert len(gdp) == SERIES * PERIODS
+    assert list(gdp.columns) == ["freq", "unit", "na_item", "geo", "period", "value", "flag"]
+    assert sorted(gdp["geo"].unique()) == ["DE", "EA19", "FR"]
+    assert set(gdp["na_item"]) == {"B1GQ"}
+    assert gdp["period"].astype(str).min() == "1975"
+    assert gdp["period"].astype(str).max() == "2024"
+
+
+def test_read_tsv_missing_values_are_nan(gdp):
+    assert gdp["value"].isna().sum() == MISSING
+    de = gdp[gdp["geo"] == "DE"]
+    de = de.set_index(de["period"].astype(str))
+    assert math.isnan(de.loc["1990", "value"])
+    assert de.loc["1991", "value"] == 1517932.9
+
+
+def test_read_tsv_splits_flags(gdp):
+    row = gdp[(gdp["geo"] == "DE") & (gdp["period"].astype(str) == "2021")].iloc[0]
+    assert row["value"] == 3676460.0
+    assert row["flag"] == "p"
+    assert set(gdp["flag"].astype(str)) == {"", "p"}
+
+
+def test_read_tsv_filters_on_the_key():
+    fr = read_tsv(GDP_TSV, filters={"geo": ["FR"]})
+    assert len(fr) == PERIODS
+    assert set(fr["geo"]) == {"FR"}
+    assert fr["value"].notna().all()
+
+
+def test_iter_records_matches_read_tsv(gdp):
+    with open(GDP_TSV, encoding="utf-8") as f:
+        records = list(iter_records(f))
+    assert len(records) == len(gdp)
+    first = records[0]
+    assert {k: first[k] for k in ("freq", "unit", "na_item", "geo", "period")} == {
+        "freq": "A", "unit": "CP_MEUR", "na_item": "B1GQ", "geo": "DE", "period": "1975",
+    }
+    assert math.isnan(first["value"]) and first["flag"] == ""
+    assert sum(math.isnan(r["value"]) for r in records) == MISSING
+    assert sum(r["flag"] == "p" for r in records) == sum(gdp["flag"] == "p")
+
+
+def test_split_cells():
+    value, flag = split_cells(pa.array(["1234.5 ", "1234.5 p", ": ", ": c", "", "2024.0"]))
+    assert value.to_pylist() == [1234.5, 1234.5, None, None, None, 2024.0]
+    assert flag.to_pylist() == ["", "p", "", "c", "", ""]
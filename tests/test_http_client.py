@@ -0,0 +1,115 @@
+# tests/test_http_client.py
+#
+# download_if_changed against a local http.server stub that honours
+# If-None-Match / If-Modified-Since like the ECB and Eurostat APIs.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data_ingestion.http_client import commit_cache_meta, download_if_changed, load_cache_meta, make_session
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Oct 2025 08:00:00 GMT"
+BODY = b"TIME_PERIOD,OBS_VALUE\n2024-01,120.5\n"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/hicp.csv"
+
+
+def test_first_download_writes_body_and_validators(server, url, tmp_path):
+    path = tmp_path / "raw" / "hicp.csv"
+
+    assert download_if_changed(make_session(), url, str(path)) is True
+    assert path.read_bytes() == BODY
+    assert load_cache_meta(str(path)) == {}
+    commit_cache_meta(str(path))
+    meta = load_cache_meta(str(path))
+    assert meta["url"] == url
+    assert meta["etag"] == ETAG
+    assert meta["last_modified"] == LAST_MODIFIED
+    assert "If-None-Match" not in server.requests[0]
+
+
+def test_unchanged_resource_is_not_rewritten(server, url, tmp_path):
+    path = tmp_path / "hicp.csv"
+    session = make_session()
+    download_if_changed(session, url, str(path))
+    commit_cache_meta(str(path))
+    path.write_bytes(b"local copy")
+
+    assert download_if_changed(session, url, str(path)) is False
+    assert path.read_bytes() == b"local copy"
+    second = server.requests[1]
+    assert second["If-None-Match"] == ETAG
+    assert second["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_download_is_fetched_again_until_committed(server, url, tmp_path):
+    path = tmp_path / "hicp.csv"
+    session = make_session()
+    download_if_changed(session, url, str(path))
+
+    # The load after the first download failed: nothing was committed
+    assert download_if_changed(session, url, str(path)) is True
+    assert "If-None-Match" not in server.requests[1]
+
+    commit_cache_meta(str(path))
+    assert download_if_changed(session, url, str(path)) is False
+
+
+def test_force_skips_the_conditional_headers(server, url, tmp_path):
+    path = tmp_path / "hicp.csv"
+    session = make_session()
+    download_if_changed(session, url, str(path))
+    path.write_bytes(b"local copy")
+
+    assert download_if_changed(session, url, str(path), force=True) is True
+    assert path.read_bytes() == BODY
+    assert "If-None-Match" not in server.requests[1]
+    assert "If-Modified-Since" not in server.requests[1]
+
+
+def test_validators_of_another_url_are_not_sent(server, url, tmp_path):
+    path = tmp_path / "hicp.csv"
+    download_if_changed(make_session(), url, str(path))
+    commit_cache_meta(str(path))
+    meta = load_cache_meta(str(path))
+    with open(f"{path}.meta.json", "w", encoding="utf-8") as f:
+        json.dump({**meta, "url": url + "?startPeriod=2024-01"}, f)
+
+    assert download_if_changed(make_session(), url, str(path)) is True
+    assert "If-None-Match" not in server.requests[1]
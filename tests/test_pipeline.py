@@ -0,0 +1,78 @@
+# tests/test_pipeline.py
+#
+# run_pipeline's skip rules on a small DAG of file-based stages: a stage is
+# skipped only when its files match the last run it succeeded on.
+
+import pytest
+
+from data_ingestion import pipeline
+from data_ingestion.pipeline import Stage, run_pipeline
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "STATE_PATH", str(tmp_path / "pipeline_state.json"))
+    monkeypatch.setattr(pipeline, "TIMINGS_PATH", str(tmp_path / "logs" / "runs.jsonl"))
+    return tmp_path
+
+
+def make_stages(workdir, calls, fail=()):
+    raw, clean = workdir / "raw.csv", workdir / "clean.csv"
+
+    def fetch(ctx):
+        calls.append("fetch")
+        return False  # the source answered 304
+
+    def clean_stage(ctx):
+        calls.append("clean")
+        clean.write_text(raw.read_text().upper())
+        return True
+
+    def load(ctx):
+        calls.append("load")
+        if "load" in fail:
+            raise RuntimeError("database went away")
+        return True
+
+    return [
+        Stage("x.fetch", [], fetch),
+        Stage("x.clean", ["x.fetch"], clean_stage, (str(raw), str(clean))),
+        Stage("x.load", ["x.clean"], load, (str(clean),)),
+    ]
+
+
+def test_unchanged_inputs_are_skipped(workdir):
+    (workdir / "raw.csv").write_text("a,b\n")
+    calls = []
+    run_pipeline(make_stages(workdir, calls), workers=1, database_url="sqlite://")
+    calls.clear()
+
+    status = run_pipeline(make_stages(workdir, calls), workers=1, database_url="sqlite://")
+
+    assert calls == ["fetch"]
+    assert status == {"x.fetch": "ran", "x.clean": "skipped", "x.load": "skipped"}
+
+
+def test_failed_stage_is_retried_by_the_next_run(workdir):
+    (workdir / "raw.csv").write_text("a,b\n")
+    calls = []
+    status = run_pipeline(make_stages(workdir, calls, fail=("load",)), workers=1, database_url="sqlite://")
+    assert status["x.load"] == "failed"
+    calls.clear()
+
+    status = run_pipeline(make_stages(workdir, calls), workers=1, database_url="sqlite://")
+
+    assert calls == ["fetch", "load"]
+    assert status["x.load"] == "ran"
+
+
+def test_missing_output_is_rebuilt(workdir):
+    (workdir / "raw.csv").write_text("a,b\n")
+    calls = []
+    run_pipeline(make_stages(workdir, calls), workers=1, database_url="sqlite://")
+    (workdir / "clean.csv").unlink()
+    calls.clear()
+
+    run_pipeline(make_stages(workdir, calls), workers=1, database_url="sqlite://")
+
+    assert calls == ["fetch", "clean", "load"]